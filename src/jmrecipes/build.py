@@ -1,8 +1,14 @@
 """Builds a recipe website."""
 
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
 import datetime
+from functools import partial
+import hashlib
+import json
 import os
 from pathlib import Path
+import pickle
 import shutil
 from typing import Optional
 
@@ -10,40 +16,135 @@ from jmrecipes.builder import from_file
 from jmrecipes.builder import recipe_builder
 from jmrecipes.builder import collection_builder
 from jmrecipes.builder import site_builder
-from jmrecipes.paths import get_paths
+from jmrecipes.paths import get_paths, set_paths
 from jmrecipes.utils import qr, template, utils
 
+DATA_EXTENSIONS = (".json", ".yaml", ".yml")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+# Processing steps for site data, in order
+_SITE_STEPS = (
+    site_builder.set_child_recipe_links,
+    site_builder.set_recipes_used_in,
+    site_builder.set_ingredient_as_recipe_quantities,
+    site_builder.set_costs,
+    site_builder.set_costs_per_serving,
+    site_builder.set_cost_strings,
+    site_builder.set_nutrition,
+    site_builder.set_display_nutrition,
+    site_builder.set_ingredient_details,
+    site_builder.set_description_areas,
+    site_builder.set_ingredient_lists,
+    site_builder.link_recipes_collections,
+    site_builder.set_search_values,
+    site_builder.set_summary,
+)
+
+# Processing steps for each recipe, in order
+_RECIPE_STEPS = (
+    recipe_builder.normalize_yields,
+    recipe_builder.normalize_instructions,
+    recipe_builder.normalize_ingredients,
+    recipe_builder.set_title,
+    recipe_builder.set_url,
+    recipe_builder.set_description,
+    recipe_builder.set_image,
+    recipe_builder.set_scales,
+    recipe_builder.set_times,
+    recipe_builder.scale_yields,
+    recipe_builder.set_servings,
+    recipe_builder.set_visible_yields,
+    recipe_builder.set_visible_serving_sizes,
+    recipe_builder.set_copy_ingredients_sublabel,
+    recipe_builder.set_ingredients_type,
+    recipe_builder.scale_ingredients,
+    recipe_builder.lookup_groceries,
+    recipe_builder.set_ingredient_outputs,
+    recipe_builder.set_instructions,
+    recipe_builder.set_sources,
+    recipe_builder.set_notes,
+    recipe_builder.set_videos,
+    recipe_builder.set_schema,
+    recipe_builder.set_search_targets,
+    recipe_builder.set_special_cases,
+)
+
+# Processing steps for each collection, in order
+_COLLECTION_STEPS = (
+    collection_builder.set_collection_defaults,
+    collection_builder.set_homepage,
+    collection_builder.set_collection_url,
+)
+
+
+def build(log: bool = False):
+    """Loads site data and creates a recipe website.
 
-def build():
-    """Loads site data and creates a recipe website."""
+    Args:
+        log: Saves the data after every processing step in build-log files
+            if true. Defaults to False.
+    """
 
     timestamp = datetime.datetime.now()
 
     paths = get_paths()
     latest_folder = paths.builds_dir / "latest"
-    # site_web = latest_folder / "web"
-    # site_local = latest_folder / "local"
     site_log_path = latest_folder / "build-log"
 
     # utils.create_dir(paths.builds_dir)
-    utils.make_empty_dir(latest_folder)
+    # keep previous site output so unchanged recipe pages can be reused,
+    # but never logs from an earlier build
+    shutil.rmtree(site_log_path, ignore_errors=True)
+    if log:
+        site_log_path.mkdir(parents=True)
+    else:
+        site_log_path = None
     # utils.create_dir(site_log_path)
 
-    site = load_site(paths.data_dir, site_log_path)
-    build_site(site, latest_folder / "web", timestamp, verbose=True)
-    build_site(site, latest_folder / "local", timestamp, local=True)
+    site_web = latest_folder / "web"
+    site_local = latest_folder / "local"
+    manifests_path = paths.cache_dir / "manifests"
+    # one pool for the whole build, so workers are only started once
+    with worker_pool() as executor:
+        site = load_site(paths.data_dir, site_log_path, paths.cache_dir, executor)
+        build_site(
+            site,
+            site_web,
+            timestamp,
+            verbose=True,
+            executor=executor,
+            manifest_path=manifests_path / "web.json",
+        )
+        build_site(
+            site,
+            site_local,
+            timestamp,
+            local=True,
+            executor=executor,
+            manifest_path=manifests_path / "local.json",
+        )
 
     timestamp_folder = paths.builds_dir / timestamp.strftime("%Y-%m-%d %H-%M-%S")
-    shutil.copytree(latest_folder, timestamp_folder)
+    # build outputs are replaced, never edited in place, so links are safe
+    shutil.copytree(latest_folder, timestamp_folder, copy_function=utils.link_or_copy)
     print("Build complete")
 
 
-def load_site(data_path: Path, site_log_path: Optional[Path] = None) -> dict:
+def load_site(
+    data_path: Path,
+    site_log_path: Optional[Path] = None,
+    cache_path: Optional[Path] = None,
+    executor: Optional[Executor] = None,
+) -> dict:
     """Loads site data from directory.
 
     Args:
         data_path: Directory with site data files.
         log: Directory to save site level log files.
+        cache_path: Directory to cache loaded data in between builds.
+            Nothing is cached if None.
+        executor: Pool to load recipes and collections in. A new worker
+            pool is used if not given.
 
     Returns:
         Site data as a dictionary.
@@ -54,64 +155,164 @@ def load_site(data_path: Path, site_log_path: Optional[Path] = None) -> dict:
     recipes_data_path = data_path / "recipes"
     collections_data_path = data_path / "collections"
 
+    recipes_log_path = collections_log_path = None
     if site_log_path is not None:
         recipes_log_path = site_log_path / "recipes"
         collections_log_path = site_log_path / "collections"
-        recipes = load_recipes(recipes_data_path, recipes_log_path=recipes_log_path)
+
+    parse_cache_path = None
+    if cache_path is not None:
+        parse_cache_path = cache_path / "parsed"
+
+    pool = worker_pool() if executor is None else nullcontext(executor)
+    with pool as executor:
+        recipes = load_recipes(
+            recipes_data_path, recipes_log_path, cache_path, executor
+        )
         collections = load_collections(
-            collections_data_path, collections_log_path=collections_log_path
+            collections_data_path, collections_log_path, parse_cache_path, executor
         )
-    else:
-        recipes = load_recipes(recipes_data_path)
-        collections = load_collections(collections_data_path)
+
+    if parse_cache_path is not None:
+        # drop cached copies of data files that were deleted or moved
+        data_file_paths = list(recipes_data_path.glob("*/*"))
+        if collections_data_path.exists():
+            data_file_paths.extend(collections_data_path.iterdir())
+        from_file.prune_cache(parse_cache_path, data_file_paths)
 
     site = {"recipes": recipes, "collections": collections}
-    return utils.pipe(
-        site,
-        site_log_path,
-        site_builder.set_child_recipe_links,
-        site_builder.set_recipes_used_in,
-        site_builder.set_ingredient_as_recipe_quantities,
-        site_builder.set_costs,
-        site_builder.set_costs_per_serving,
-        site_builder.set_cost_strings,
-        site_builder.set_nutrition,
-        site_builder.set_display_nutrition,
-        site_builder.set_ingredient_details,
-        site_builder.set_description_areas,
-        site_builder.set_ingredient_lists,
-        site_builder.link_recipes_collections,
-        site_builder.set_search_values,
-        site_builder.set_summary,
-    )
+    return utils.pipe(site, site_log_path, *_SITE_STEPS)
 
 
-def load_recipes(recipes_path: Path, recipes_log_path: Optional[Path] = None) -> list:
+def load_recipes(
+    recipes_path: Path,
+    recipes_log_path: Optional[Path] = None,
+    cache_path: Optional[Path] = None,
+    executor: Optional[Executor] = None,
+) -> list:
     """Loads data for recipes.
 
     Args:
         recipes_path: Directory that contains recipe data folders.
         log: Directory to save recipes level log files.
+        cache_path: Directory to cache loaded data in between builds. A
+            recipe whose folder and shared inputs are unchanged is read from
+            the cache, unless pipe log files are being written.
+        executor: Pool to load recipes in. A new worker pool is used if not
+            given.
 
     Returns:
         Recipes data as a list of dictionaries, one for each recipe.
     """
 
-    has_log = recipes_log_path is not None
-    if has_log:
-        recipes_log_path.mkdir(parents=True, exist_ok=True)
+    with os.scandir(recipes_path) as entries:
+        recipe_folders = [entry.name for entry in entries if entry.is_dir()]
+
+    recipe_paths = [recipes_path / folder for folder in recipe_folders]
+    recipe_log_paths = [None] * len(recipe_folders)
+    if recipes_log_path is not None:
+        recipe_log_paths = [recipes_log_path / folder for folder in recipe_folders]
+        utils.make_dirs(recipe_log_paths)
+
+    loader = load_recipe
+    if cache_path is not None:
+        recipes_cache_path = cache_path / "recipes"
+        recipes_cache_path.mkdir(parents=True, exist_ok=True)
+        loader = partial(
+            load_cached_recipe,
+            recipes_cache_path=recipes_cache_path,
+            parse_cache_path=cache_path / "parsed",
+            inputs_digest=recipe_inputs_digest(),
+        )
+
+    # recipes load independently, so spread them across processes
+    pool = worker_pool() if executor is None else nullcontext(executor)
+    with pool as executor:
+        return list(executor.map(loader, recipe_paths, recipe_log_paths))
+
 
-    recipes = []
-    for recipe_folder in os.listdir(recipes_path):
-        recipe_path = recipes_path / recipe_folder
-        recipe_log_path = None
-        if has_log:
-            recipe_log_path = recipes_log_path / recipe_folder
-        recipes.append(load_recipe(recipe_path, recipe_log_path))
-    return recipes
+def load_cached_recipe(
+    recipe_path: Path,
+    recipe_log_path: Optional[Path],
+    recipes_cache_path: Path,
+    parse_cache_path: Path,
+    inputs_digest: str,
+) -> dict:
+    """Loads a recipe, reusing the result of an earlier build if unchanged.
 
+    A recipe that is logged is always rebuilt, since a cached recipe has no
+    pipe log files. Its cache file is still refreshed.
 
-def load_recipe(recipe_path: Path, recipe_log_path: Optional[Path] = None) -> dict:
+    Args:
+        recipe_path: Directory for a recipe's data.
+        recipe_log_path: Existing directory to save recipe pipe log files.
+        recipes_cache_path: Directory with a cache file for each recipe.
+        parse_cache_path: Directory to cache parsed data files in.
+        inputs_digest: Digest of inputs shared by all recipes, from
+            recipe_inputs_digest().
+
+    Returns:
+        Recipe data as a dictionary.
+    """
+
+    digest = hashlib.blake2b(inputs_digest.encode())
+    digest.update(recipe_path.name.encode())
+    with os.scandir(recipe_path) as entries:
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            stat = entry.stat()
+            digest.update(f"{entry.name} {stat.st_size} {stat.st_mtime_ns}".encode())
+    key = digest.hexdigest()
+
+    cache_file_path = recipes_cache_path / f"{recipe_path.name}.pickle"
+    if recipe_log_path is None:
+        try:
+            with open(cache_file_path, "rb") as f:
+                cached_key, recipe = pickle.load(f)
+            if cached_key == key:
+                return recipe
+        except (OSError, EOFError, ValueError, pickle.PickleError):
+            pass
+
+    recipe = load_recipe(recipe_path, recipe_log_path, parse_cache_path)
+    utils.write_file(pickle.dumps((key, recipe)), cache_file_path)
+    return recipe
+
+
+def recipe_inputs_digest() -> str:
+    """Returns a digest of inputs that affect every recipe's data.
+
+    Covers the config file, the unit and grocery tables, and the jmrecipes
+    source code, so changing any of them reloads every recipe.
+    """
+
+    paths = get_paths()
+    input_paths = [
+        paths.config_file,
+        paths.data_dir / "units.csv",
+        paths.data_dir / "groceries.xlsx",
+        *sorted(Path(__file__).parent.rglob("*.py")),
+    ]
+    digest = hashlib.blake2b()
+    for path in input_paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        digest.update(f"{path} {stat.st_size} {stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def worker_pool() -> ProcessPoolExecutor:
+    """Returns a process pool whose workers share this process's paths."""
+
+    return ProcessPoolExecutor(initializer=set_paths, initargs=(get_paths(),))
+
+
+def load_recipe(
+    recipe_path: Path,
+    recipe_log_path: Optional[Path] = None,
+    parse_cache_path: Optional[Path] = None,
+) -> dict:
     """Generates recipe data from a folder.
 
     Extracts data from folder, including the data file, image, and folder name
@@ -119,103 +320,78 @@ def load_recipe(recipe_path: Path, recipe_log_path: Optional[Path] = None) -> di
 
     Args:
         recipe_path: Directory for a recipe's data.
-        recipe_log_path: Directory to save recipe pipe log files.
+        recipe_log_path: Existing directory to save recipe pipe log files.
+        parse_cache_path: Directory to cache the parsed data file in.
 
     Returns:
         Recipes data as a dictionary.
     """
 
-    file_name = recipe_file(recipe_path)
+    file_name, image = recipe_files(recipe_path)
     file_path = recipe_path / file_name
-    file_data = from_file.recipe(file_path)
+    file_data = from_file.recipe(file_path, parse_cache_path)
     file_data["folder_name"] = os.path.basename(recipe_path)
 
     recipe = {}
     recipe["file"] = file_data
 
-    image = recipe_image(recipe_path)
     if image:
         recipe["image"] = image
         recipe["image_path"] = os.path.join(recipe_path, image)
 
-    if recipe_log_path is not None:
-        # utils.create_dir(recipe_log_path)
-        recipe_log_path.mkdir(parents=True, exist_ok=True)
-
-    return utils.pipe(
-        recipe,
-        recipe_log_path,
-        recipe_builder.normalize_yields,
-        recipe_builder.normalize_instructions,
-        recipe_builder.normalize_ingredients,
-        recipe_builder.set_title,
-        recipe_builder.set_url,
-        recipe_builder.set_description,
-        recipe_builder.set_image,
-        recipe_builder.set_scales,
-        recipe_builder.set_times,
-        recipe_builder.scale_yields,
-        recipe_builder.set_servings,
-        recipe_builder.set_visible_yields,
-        recipe_builder.set_visible_serving_sizes,
-        recipe_builder.set_copy_ingredients_sublabel,
-        recipe_builder.set_ingredients_type,
-        recipe_builder.scale_ingredients,
-        recipe_builder.lookup_groceries,
-        recipe_builder.set_ingredient_outputs,
-        recipe_builder.set_instructions,
-        recipe_builder.set_sources,
-        recipe_builder.set_notes,
-        recipe_builder.set_videos,
-        recipe_builder.set_schema,
-        recipe_builder.set_search_targets,
-        recipe_builder.set_special_cases,
-    )
+    return utils.pipe(recipe, recipe_log_path, *_RECIPE_STEPS)
+
 
+def recipe_files(recipe_path: Path) -> tuple[str, str]:
+    """Finds the recipe data file and image file inside a folder.
 
-def recipe_file(recipe_path: Path) -> str:
-    """Finds a recipe data file inside a folder.
+    Scans the folder once for both files. Data files are picked in the order
+    of DATA_EXTENSIONS, so JSON is preferred over YAML, which is slower to
+    parse.
 
     Args:
         recipe_path: A directory to search in.
 
     Returns:
-        Filename of the recipe data file as a string.
+        Filenames of the data file and the image file as strings. The image
+        filename is an empty string if there is no image.
 
     Raises:
         OSError: If no recipe data file was found.
     """
 
-    for file in os.listdir(recipe_path):
-        if file.endswith((".json", ".yaml")):
-            return file
-    raise OSError(f"Recipe data file not found in {dir}")
-
-
-def recipe_image(recipe_path: Path) -> str:
-    """Finds a recipe image file inside a folder.
+    data_files = {}
+    image_file = ""
+    with os.scandir(recipe_path) as entries:
+        for entry in entries:
+            name = entry.name
+            extension = os.path.splitext(name)[1].lower()
+            if extension in DATA_EXTENSIONS:
+                data_files.setdefault(extension, name)
+            elif extension in IMAGE_EXTENSIONS:
+                image_file = image_file or name
 
-    Args:
-        recipe_path: A directory to search in.
-
-    Returns:
-        Filename of the image file as a string, or empty string if no image.
-    """
-
-    for file in os.listdir(recipe_path):
-        if file.endswith((".jpg", ".jpeg", "png")):
-            return file
-    return ""
+    extension = next((e for e in DATA_EXTENSIONS if e in data_files), None)
+    data_file = data_files.get(extension)
+    if not data_file:
+        raise OSError(f"Recipe data file not found in {recipe_path}")
+    return data_file, image_file
 
 
 def load_collections(
-    collections_path: Path, collections_log_path: Optional[Path] = None
+    collections_path: Path,
+    collections_log_path: Optional[Path] = None,
+    parse_cache_path: Optional[Path] = None,
+    executor: Optional[Executor] = None,
 ) -> list:
     """Generates data for collections.
 
     Args:
         collections_path: Directory that contains collections data files.
         collections_log_path: Directory to save collection log files.
+        parse_cache_path: Directory to cache parsed data files in.
+        executor: Pool to load collections in. A new worker pool is used if
+            not given.
 
     Returns:
         Collections data as a list of dictionaries.
@@ -224,45 +400,39 @@ def load_collections(
     if not collections_path.exists():
         return []
 
-    has_log = collections_log_path is not None
-    if has_log:
-        # utils.create_dir(collections_log_path)
-        collections_log_path.mkdir(parents=True, exist_ok=True)
-
-    collections = []
-    for collection_file in os.listdir(collections_path):
-        collection_file_path = collections_path / collection_file
+    with os.scandir(collections_path) as entries:
+        collection_files = [entry.name for entry in entries if entry.is_file()]
+    collection_paths = [collections_path / file for file in collection_files]
+    collection_log_paths = [None] * len(collection_files)
+    if collections_log_path is not None:
+        collection_log_paths = [collections_log_path / f for f in collection_files]
+        utils.make_dirs(collection_log_paths)
 
-        if has_log:
-            collection_log_path = collections_log_path / collection_file
-            collections.append(
-                load_collection(collection_file_path, collection_log_path)
-            )
-        else:
-            collections.append(load_collection(collection_file_path))
-    return collections
+    loader = partial(load_collection, parse_cache_path=parse_cache_path)
+    pool = worker_pool() if executor is None else nullcontext(executor)
+    with pool as executor:
+        return list(executor.map(loader, collection_paths, collection_log_paths))
 
 
 def load_collection(
-    collection_file_path: Path, collection_log_path: Optional[Path] = None
+    collection_file_path: Path,
+    collection_log_path: Optional[Path] = None,
+    parse_cache_path: Optional[Path] = None,
 ) -> dict:
     """Generates data for a collection.
 
     Args:
         file_path: Directory that contains collections data files.
-        collection_log_path: Directory to save collection pipe log files.
+        collection_log_path: Existing directory to save collection pipe log
+            files.
+        parse_cache_path: Directory to cache the parsed data file in.
 
     Returns:
         Collection data as a dictionary.
     """
 
-    return utils.pipe(
-        from_file.collection(collection_file_path),
-        collection_log_path,
-        collection_builder.set_collection_defaults,
-        collection_builder.set_homepage,
-        collection_builder.set_collection_url,
-    )
+    collection = from_file.collection(collection_file_path, parse_cache_path)
+    return utils.pipe(collection, collection_log_path, *_COLLECTION_STEPS)
 
 
 def build_site(
@@ -271,6 +441,8 @@ def build_site(
     timestamp: datetime.datetime,
     local=False,
     verbose=False,
+    executor: Optional[Executor] = None,
+    manifest_path: Optional[Path] = None,
 ) -> None:
     """Builds a recipe site using site data.
 
@@ -278,42 +450,178 @@ def build_site(
         site: Site data as a dictionary.
         site_path: Path to build the site inside.
         local: Builds local version if true, web version otherwise. Defaults is False.
+        executor: Pool to render recipe and collection pages in. A new
+            worker pool is used if not given.
+        manifest_path: File to track the pages of site_path in between
+            builds, kept outside the site so it is never published. The
+            whole site is rebuilt if None.
+
+    Recipe pages are only rebuilt when their data, image, or templates
+    changed since the last build into site_path, tracked in the manifest.
     """
 
-    utils.make_empty_dir(site_path)
+    old_manifest = {}
+    if manifest_path is not None:
+        old_manifest = read_manifest(manifest_path)
+    # a manifest only describes the site folder it was written for
+    if old_manifest.get("site_path") != str(site_path) or not site_path.is_dir():
+        old_manifest = {}
+        utils.make_empty_dir(site_path)
+
+    site_title = utils.site_title()
+    icons = template.get_icons()
+    pages_hash = recipe_pages_hash(local, site_title, icons)
+    manifest = {
+        "site_path": str(site_path),
+        "recipes": {},
+        "collections": [c["url_path"] for c in site["collections"]],
+    }
+
+    # each page's output is independent, so render them across processes
+    pool = worker_pool() if executor is None else nullcontext(executor)
+    with pool as executor:
+        futures = []
+        for recipe in site["recipes"]:
+            recipe_dir = site_path / recipe["url_slug"]
+
+            digest = recipe_digest(recipe, pages_hash)
+            manifest["recipes"][recipe["url_slug"]] = digest
+            if (
+                old_manifest.get("recipes", {}).get(recipe["url_slug"]) == digest
+                and (recipe_dir / "index.html").exists()
+            ):
+                if verbose:
+                    print(f'Recipe: {recipe["title"]} (unchanged)')
+                continue
+
+            future = executor.submit(
+                make_recipe_output, recipe, recipe_dir, local, site_title, icons
+            )
+            futures.append((recipe, future))
+
+        for recipe, future in futures:
+            future.result()
+            if verbose:
+                print(f'Recipe: {recipe["title"]}')
+
+        # a collection may share its folder with a recipe, so start after them
+        futures = []
+        for collection in site["collections"]:
+            collection_dir = get_collection_dir(collection, site_path)
+            future = executor.submit(
+                make_collection_page,
+                collection,
+                collection_dir,
+                local,
+                site_title,
+                icons,
+            )
+            futures.append((collection, future))
 
-    for recipe in site["recipes"]:
-        recipe_dir = site_path / recipe["url_slug"]
-        recipe_print_dir = recipe_dir / "p"
-        recipe_qr_path = recipe_dir / "recipe-qr.png"
+        make_404_page(site_path / "404.html", site_title)
+        summary_path = site_path / "summary.html"
+        make_summary_page(site, timestamp, local, summary_path, site_title)
 
-        make_recipe_page(recipe, recipe_dir, local)
-        make_print_page(recipe, recipe_print_dir, local)
-        qr.create(recipe["url"], recipe_qr_path)
+        for collection, future in futures:
+            future.result()
+            if verbose:
+                print(f'Collection: {collection["name"]}')
 
-        if recipe["has_image"]:
-            shutil.copyfile(recipe["image_path"], recipe_dir / recipe["image"])
-        if verbose:
-            print(f'Recipe: {recipe["title"]}')
+    remove_stale_pages(site_path, old_manifest, manifest)
 
-    for collection in site["collections"]:
-        collection_dir = get_collection_dir(collection, site_path)
-        make_collection_page(collection, collection_dir, local)
-        if verbose:
-            print(f'Collection: {collection["name"]}')
+    assets_dir = get_paths().assets_dir
+    utils.copy_file(assets_dir / "icon.png", site_path / "icon.png")
+    utils.copy_file(assets_dir / "default_720x540.jpg", site_path / "default.jpg")
+    if manifest_path is not None:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        utils.write_file(json.dumps(manifest, indent=4), manifest_path)
 
-    make_404_page(site_path / "404.html")
-    make_summary_page(site, timestamp, local, site_path / "summary.html")
 
-    assets_dir = get_paths().assets_dir
-    shutil.copyfile(
-        os.path.join(assets_dir, "icon.png"),
-        os.path.join(site_path, "icon.png"),
-    )
-    shutil.copyfile(
-        os.path.join(assets_dir, "default_720x540.jpg"),
-        os.path.join(site_path, "default.jpg"),
-    )
+def make_recipe_output(
+    recipe: dict, recipe_dir: Path, local: bool, site_title: str, icons: dict
+) -> None:
+    """Creates a recipe's folder with its pages, QR code, and image.
+
+    Args:
+        recipe: Recipe data as a dictionary.
+        recipe_dir: Folder to create the recipe output inside.
+        local: Builds local version if true, web version otherwise.
+        site_title: Title of the site.
+        icons: SVG icons by name.
+    """
+
+    utils.make_empty_dir(recipe_dir)
+    make_recipe_page(recipe, recipe_dir, local, site_title, icons)
+    make_print_page(recipe, recipe_dir / "p", local, site_title, icons)
+    qr_path = recipe_dir / "recipe-qr.png"
+    qr.create(recipe["url"], qr_path, get_paths().cache_dir / "qr")
+
+    if recipe["has_image"]:
+        image_path = recipe_dir / recipe["image"]
+        utils.copy_file(recipe["image_path"], image_path)
+
+
+def read_manifest(manifest_path: Path) -> dict:
+    """Reads the build manifest of a previous site build.
+
+    Returns:
+        Manifest as a dictionary, or empty dictionary if there is no
+        readable manifest.
+    """
+
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def recipe_pages_hash(local: bool, site_title: str, icons: dict):
+    """Returns a hash of inputs shared by every recipe's pages.
+
+    Includes the build type, site title, icons, and the recipe page
+    templates, so editing any of these rebuilds every recipe.
+    """
+
+    pages_hash = hashlib.blake2b()
+    pages_hash.update(json.dumps([local, site_title, icons], sort_keys=True).encode())
+    templates_dir = get_paths().templates_dir
+    for template_name in ("recipe-page.html", "print-page.html"):
+        pages_hash.update((templates_dir / template_name).read_bytes())
+    return pages_hash
+
+
+def recipe_digest(recipe: dict, pages_hash) -> str:
+    """Returns a digest of everything that goes into a recipe's output.
+
+    Args:
+        recipe: Recipe data as a dictionary.
+        pages_hash: Hash of inputs shared by all recipes, from
+            recipe_pages_hash().
+    """
+
+    recipe_hash = pages_hash.copy()
+    recipe_json = json.dumps(recipe, sort_keys=True, default=str)
+    recipe_hash.update(recipe_json.encode())
+    if recipe["has_image"]:
+        recipe_hash.update(str(os.stat(recipe["image_path"]).st_mtime_ns).encode())
+    return recipe_hash.hexdigest()
+
+
+def remove_stale_pages(site_path: Path, old_manifest: dict, manifest: dict) -> None:
+    """Deletes output of recipes and collections no longer in the site."""
+
+    recipe_slugs = manifest["recipes"].keys()
+    collection_paths = set(manifest["collections"])
+    for slug in old_manifest.get("recipes", {}).keys() - recipe_slugs:
+        if slug not in collection_paths:
+            shutil.rmtree(site_path / slug, ignore_errors=True)
+
+    for url_path in set(old_manifest.get("collections", [])) - collection_paths:
+        if url_path == "":
+            (site_path / "index.html").unlink(missing_ok=True)
+        elif url_path not in recipe_slugs:
+            shutil.rmtree(site_path / url_path, ignore_errors=True)
 
 
 def get_collection_dir(collection: dict, site_path: Path) -> Path:
@@ -324,13 +632,17 @@ def get_collection_dir(collection: dict, site_path: Path) -> Path:
     return site_path / collection["url_path"]
 
 
-def make_recipe_page(recipe: dict, output_dir: Path, local: bool) -> None:
+def make_recipe_page(
+    recipe: dict, output_dir: Path, local: bool, site_title: str, icons: dict
+) -> None:
     """Create index.html file for recipe page.
 
     Args:
         recipe: Recipe data as a dictionary.
         output_dir: Path to build the page inside.
         local: Builds local version if true, web version otherwise.
+        site_title: Site title from config file.
+        icons: SVG icons from template.get_icons().
     """
 
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -338,20 +650,24 @@ def make_recipe_page(recipe: dict, output_dir: Path, local: bool) -> None:
     content = template.render(
         "recipe-page.html",
         r=recipe,
-        icon=template.get_icons(),
-        site_title=utils.site_title(),
+        icon=icons,
+        site_title=site_title,
         is_local=local,
     )
     utils.write_file(content, file_path)
 
 
-def make_print_page(recipe: dict, output_dir: Path, local: bool) -> None:
+def make_print_page(
+    recipe: dict, output_dir: Path, local: bool, site_title: str, icons: dict
+) -> None:
     """Create index.html file for recipe print page.
 
     Args:
         recipe: Recipe data as a dictionary.
         output_dir: Path to build the page inside.
         local: Builds local version if true, web version otherwise.
+        site_title: Site title from config file.
+        icons: SVG icons from template.get_icons().
     """
 
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -360,19 +676,27 @@ def make_print_page(recipe: dict, output_dir: Path, local: bool) -> None:
         "print-page.html",
         r=recipe,
         is_local=local,
-        site_title=utils.site_title(),
-        icon=template.get_icons(),
+        site_title=site_title,
+        icon=icons,
     )
     utils.write_file(content, file_path)
 
 
-def make_collection_page(collection: dict, collection_dir: Path, local: bool) -> None:
+def make_collection_page(
+    collection: dict,
+    collection_dir: Path,
+    local: bool,
+    site_title: str,
+    icons: dict,
+) -> None:
     """Create index.html file for collection page.
 
     Args:
         collection: Collection data as a dictionary.
         collection_dir: Path to build the page inside.
         local: Builds local version if true, web version otherwise.
+        site_title: Site title from config file.
+        icons: SVG icons from template.get_icons().
     """
 
     collection_dir.mkdir(parents=True, exist_ok=True)
@@ -381,20 +705,25 @@ def make_collection_page(collection: dict, collection_dir: Path, local: bool) ->
         "collection.html",
         c=collection,
         is_local=local,
-        site_title=utils.site_title(),
-        icon=template.get_icons(),
+        site_title=site_title,
+        icon=icons,
     )
     utils.write_file(content, file_path)
 
 
 def make_summary_page(
-    site: dict, timestamp: datetime.datetime, local: bool, page_path: Path
+    site: dict,
+    timestamp: datetime.datetime,
+    local: bool,
+    page_path: Path,
+    site_title: str,
 ) -> None:
     """Create summary page for recipe site.
 
     Args:
         site: Site data as a dictionary.
         page_path: File path for summary page.
+        site_title: Site title from config file.
     """
 
     content = template.render(
@@ -404,18 +733,19 @@ def make_summary_page(
         collections=site["summary"]["collections"],
         ingredients=site["summary"]["ingredients"],
         groceries=site["summary"]["groceries"],
-        site_title=utils.site_title(),
+        site_title=site_title,
         is_local=local,
     )
     utils.write_file(content, page_path)
 
 
-def make_404_page(page_path: Path) -> None:
+def make_404_page(page_path: Path, site_title: str) -> None:
     """Create 404 page for recipe site.
 
     Args:
         page_path: File path for 404 page.
+        site_title: Site title from config file.
     """
 
-    content = template.render("404.html", site_title=utils.site_title())
+    content = template.render("404.html", site_title=site_title)
     utils.write_file(content, page_path)
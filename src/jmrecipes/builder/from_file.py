@@ -1,47 +1,129 @@
 """Read recipe and collection files for build."""
 
-import json
+import hashlib
+import os
 from pathlib import Path
+from typing import Iterable, Optional
+
 import yaml
 
+from jmrecipes.utils import utils
+
+try:
+    # C JSON parser, several times faster than the standard library
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+try:
+    # libyaml C bindings, much faster than the pure-Python loader
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+def _load_yaml(data: bytes):
+    """Parses YAML data with the fastest available safe loader."""
+
+    return yaml.load(data, Loader=_YamlLoader)
+
 
-def collection(file_path: Path) -> dict:
+# Parser for each supported data file extension
+_PARSERS = {
+    ".json": _json.loads,
+    ".yaml": _load_yaml,
+    ".yml": _load_yaml,
+}
+
+# Data file extensions worth caching, since JSON parses as fast as its copy
+_CACHED_SUFFIXES = (".yaml", ".yml")
+
+
+def collection(file_path: Path, cache_path: Optional[Path] = None) -> dict:
     """Converts a collection data file to a collection dictionary.
 
     Args:
         file_path: Path to collection data file.
+        cache_path: Directory to cache parsed data in between builds.
 
     Returns:
         Dict containing collection data.
     """
 
-    with open(file_path, "r", encoding="utf8") as f:
-        data = f.read()
-
-    if file_path.suffix == ".json":
-        return json.loads(data)
-    if file_path.suffix in {".yaml", ".yml"}:
-        return yaml.safe_load(data)
+    return _parse(file_path, cache_path)
 
-    raise ValueError("file is not a valid format")
 
-
-def recipe(file_path: Path) -> dict:
+def recipe(file_path: Path, cache_path: Optional[Path] = None) -> dict:
     """Converts a recipe data file to a recipe dictionary.
 
     Args:
-        filepath: Str path to recipe data file.
+        file_path: Path to recipe data file.
+        cache_path: Directory to cache parsed data in between builds.
 
     Returns:
         Dict containing recipe data.
     """
 
-    with open(file_path, "r", encoding="utf8") as f:
-        data = f.read()
+    return _parse(file_path, cache_path)
+
+
+def _parse(file_path: Path, cache_path: Optional[Path] = None) -> dict:
+    """Parses a data file, using a cached JSON copy if the file is unchanged.
+
+    Only YAML files are cached. The cache is keyed by the file's path,
+    modification time, and size. Data that does not survive a JSON round
+    trip, like YAML dates, is not cached.
+    """
+
+    suffix = file_path.suffix.lower()
+    parser = _PARSERS.get(suffix)
+    if parser is None:
+        raise ValueError("file is not a valid format")
+
+    if cache_path is None or suffix not in _CACHED_SUFFIXES:
+        # Both parsers take UTF-8 bytes, so skip decoding to str first
+        return parser(file_path.read_bytes())
+
+    stat = os.stat(file_path)
+    source = [str(file_path.resolve()), stat.st_mtime_ns, stat.st_size]
+    cache_file_path = cache_path / f"{_cache_name(file_path)}.json"
+    try:
+        cached = _json.loads(cache_file_path.read_bytes())
+        if cached["source"] == source:
+            return cached["data"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    data = parser(file_path.read_bytes())
+    try:
+        encoded = _json.dumps({"source": source, "data": data})
+    except (TypeError, ValueError):
+        return data
+    if _json.loads(encoded)["data"] == data:
+        cache_path.mkdir(parents=True, exist_ok=True)
+        utils.write_file(encoded, cache_file_path)
+    return data
+
+
+def prune_cache(cache_path: Path, file_paths: Iterable[Path]) -> None:
+    """Deletes cached copies of data files that are not in file_paths.
+
+    Args:
+        cache_path: Directory with cached data, as passed to recipe() and
+            collection().
+        file_paths: Data files whose cached copies are kept.
+    """
+
+    if not cache_path.is_dir():
+        return
+
+    keep = {_cache_name(file_path) for file_path in file_paths}
+    for cache_file_path in cache_path.glob("*.json"):
+        if cache_file_path.stem not in keep:
+            cache_file_path.unlink(missing_ok=True)
+
 
-    if file_path.suffix == ".json":
-        return json.loads(data)
-    if file_path.suffix in {".yaml", ".yml"}:
-        return yaml.safe_load(data)
+def _cache_name(file_path: Path) -> str:
+    """Returns the cache file name, without extension, for a data file."""
 
-    raise ValueError("file is not a valid format")
+    return hashlib.sha1(str(file_path.resolve()).encode()).hexdigest()
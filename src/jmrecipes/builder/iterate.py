@@ -6,23 +6,10 @@ from typing import Optional
 def scales_in(container, include=None):
     """Returns a list of recipe scales from the container."""
 
-    if include is None:
-        include = ""
-
-    scales = []
-    for recipe in _container_to_recipes(container):
-        for scale in recipe["scales"]:
-            item_list = []
-            if "r" in include:
-                item_list.append(recipe)
-            item_list.append(scale)
-
-            if len(item_list) == 1:
-                scales.append(item_list[0])
-            else:
-                scales.append(tuple(item_list))
-
-    return scales
+    recipes = _container_to_recipes(container)
+    if include and "r" in include:
+        return [(recipe, scale) for recipe in recipes for scale in recipe["scales"]]
+    return [scale for recipe in recipes for scale in recipe["scales"]]
 
 
 def ingredients_in(
@@ -77,22 +64,57 @@ def ingredients_in(
     if isinstance(keys, str):
         keys = [keys]
 
+    recipes = _container_to_recipes(container)
+
+    with_recipe = "r" in include
+    with_scale = "s" in include
+
+    # most callers want every ingredient, so skip filtering when possible
+    if not keys and not values:
+        if with_recipe and with_scale:
+            return [
+                (recipe, scale, ingredient)
+                for recipe in recipes
+                for scale in recipe["scales"]
+                for ingredient in scale["ingredients"]
+            ]
+        if with_recipe:
+            return [
+                (recipe, ingredient)
+                for recipe in recipes
+                for scale in recipe["scales"]
+                for ingredient in scale["ingredients"]
+            ]
+        if with_scale:
+            return [
+                (scale, ingredient)
+                for recipe in recipes
+                for scale in recipe["scales"]
+                for ingredient in scale["ingredients"]
+            ]
+        return [
+            ingredient
+            for recipe in recipes
+            for scale in recipe["scales"]
+            for ingredient in scale["ingredients"]
+        ]
+
+    # every filter key must be present, whether or not its value is checked
+    required_keys = (*keys, *values)
     ingredients = []
-    for recipe in _container_to_recipes(container):
+    for recipe in recipes:
         for scale in recipe["scales"]:
             for ingredient in scale["ingredients"]:
-                if _ingredient_matches_criteria(ingredient, keys, values):
-                    item_list = []
-                    if "r" in include:
-                        item_list.append(recipe)
-                    if "s" in include:
-                        item_list.append(scale)
-                    item_list.append(ingredient)
-
-                    if len(item_list) == 1:
-                        ingredients.append(item_list[0])
-                    else:
-                        ingredients.append(tuple(item_list))
+                if not _ingredient_matches_criteria(ingredient, required_keys, values):
+                    continue
+                if with_recipe and with_scale:
+                    ingredients.append((recipe, scale, ingredient))
+                elif with_recipe:
+                    ingredients.append((recipe, ingredient))
+                elif with_scale:
+                    ingredients.append((scale, ingredient))
+                else:
+                    ingredients.append(ingredient)
 
     return ingredients
 
@@ -113,21 +135,21 @@ def _container_to_recipes(container) -> list:
         list: A list of recipe dictionaries.
     """
 
-    if "recipes" in container.keys():
-        return container["recipes"]
-    elif isinstance(container, list):
+    if isinstance(container, list):
         return container
+    elif "recipes" in container:
+        return container["recipes"]
     else:
         return [container]
 
 
-def _ingredient_matches_criteria(ingredient: dict, keys: list, values: dict) -> bool:
+def _ingredient_matches_criteria(ingredient: dict, keys: tuple, values: dict) -> bool:
     """Checks if ingredient has keys and matches values.
 
     Args:
         ingredient (dict): The ingredient to be checked.
-        keys (list): A list of keys that must be present in the
-            ingredient.
+        keys (tuple): Keys that must be present in the ingredient,
+            including the keys of `values`.
         values (dict): A dictionary of key-value pairs that must match
             in the ingredient.
 
@@ -136,7 +158,7 @@ def _ingredient_matches_criteria(ingredient: dict, keys: list, values: dict) ->
             the values, False otherwise.
     """
 
-    for key in keys + list(values.keys()):
+    for key in keys:
         if key not in ingredient:
             return False
     for k, v in values.items():
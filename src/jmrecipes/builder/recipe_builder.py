@@ -1,7 +1,7 @@
 """Recipe Builder Utilities"""
 
-from collections import defaultdict
 from fractions import Fraction
+from functools import lru_cache, singledispatch
 import json
 from urllib.parse import urlparse
 from typing import Optional
@@ -14,22 +14,40 @@ from jmrecipes.utils import parse
 from jmrecipes.utils import nutrition
 from jmrecipes.builder.iterate import ingredients_in
 
+# Fractions are immutable, so every base scale can share one multiplier.
+_FRACTION_ONE = Fraction(1)
+
+# Default for dict.get when None is a meaningful value
+_MISSING = object()
+
 
 def normalize_yields(recipe):
     """Sets yield data from input file."""
 
-    yield_data = recipe["file"].get("yield", [])
-    if not isinstance(yield_data, (int, float, list)):
-        raise TypeError("Yield data must be a number or a list.")
+    recipe["yield"] = _read_yields(recipe["file"].get("yield", []))
+    return recipe
 
-    recipe["yield"] = []
-    if isinstance(yield_data, (int, float)):
-        recipe["yield"].append(make_yield_item({"number": yield_data}))
-    else:  # list
-        for yield_item in yield_data:
-            recipe["yield"].append(make_yield_item(yield_item))
 
-    return recipe
+@singledispatch
+def _read_yields(yield_data) -> list:
+    """Formats yield data from input file, by type of data."""
+
+    raise TypeError("Yield data must be a number or a list.")
+
+
+@_read_yields.register(int)
+@_read_yields.register(float)
+def _read_yields_number(yield_data) -> list:
+    """Yield data given as a single number of servings."""
+
+    return [make_yield_item({"number": yield_data})]
+
+
+@_read_yields.register(list)
+def _read_yields_list(yield_data) -> list:
+    """Yield data given as a list of yield items."""
+
+    return [make_yield_item(yield_item) for yield_item in yield_data]
 
 
 def make_yield_item(data: dict) -> dict:
@@ -38,20 +56,20 @@ def make_yield_item(data: dict) -> dict:
     if "number" not in data:
         raise KeyError("Yield data must have number field.")
 
-    yielb = {}
-    yielb["number"] = parse.to_fraction(data["number"])
-    yielb["unit"] = data.get("unit", "servings")
-    yielb["show_yield"] = bool(data.get("show_yield", True))
-    yielb["show_serving_size"] = bool(data.get("show_serving_size", False))
-    return yielb
+    return {
+        "number": parse.to_fraction(data["number"]),
+        "unit": data.get("unit", "servings"),
+        "show_yield": bool(data.get("show_yield", True)),
+        "show_serving_size": bool(data.get("show_serving_size", False)),
+    }
 
 
 def normalize_instructions(recipe):
     """Sets instructions data from input file."""
 
-    recipe["instructions"] = []
-    for step in recipe["file"].get("instructions", []):
-        recipe["instructions"].append(make_step(step))
+    recipe["instructions"] = [
+        make_step(step) for step in recipe["file"].get("instructions", ())
+    ]
 
     return recipe
 
@@ -59,34 +77,31 @@ def normalize_instructions(recipe):
 def make_step(data: str | dict) -> dict:
     """Formats instructions data from input file."""
 
-    if not isinstance(data, (str, dict)):
-        raise TypeError("Instructions step must be a string or dictionary.")
-    if isinstance(data, dict) and "text" not in data:
-        raise KeyError('Instructions step dict must include "text" field.')
-
     default_list = "Instructions"
 
     if isinstance(data, str):
         return {"text": data, "list": default_list}
+    if not isinstance(data, dict):
+        raise TypeError("Instructions step must be a string or dictionary.")
+    if "text" not in data:
+        raise KeyError('Instructions step dict must include "text" field.')
 
-    # data is dict with "text"
     step = {"text": data["text"], "list": data.get("list", default_list)}
-    if "scale" in data:
-        step["scale"] = data["scale"]
-    if "list" in data:
-        step["list"] = data["list"]
+    scale = data.get("scale", _MISSING)
+    if scale is not _MISSING:
+        step["scale"] = parse.to_fraction(scale)
     return step
 
 
 def normalize_ingredients(recipe: dict) -> dict:
     """Saves ingredient info from input file formats."""
 
-    recipe["ingredients"] = []
     file_data = recipe["file"]
 
     # 1. Default ingredients list
-    for ingredient in recipe["file"].get("ingredients", []):
-        recipe["ingredients"].append(_read_ingredient(ingredient))
+    recipe["ingredients"] = [
+        _read_ingredient(ingredient) for ingredient in file_data.get("ingredients", [])
+    ]
 
     # 2. Named ingredient lists (ingredients-staples, ...)
     prefix = "ingredients-"
@@ -105,17 +120,39 @@ def _normalize_list_name(raw: str) -> str:
     return raw.replace("_", " ").replace("-", " ").strip().title()
 
 
+# Optional ingredient fields: (input field, ingredient key, converter or None)
+_INGREDIENT_FIELDS = (
+    ("number", "number", parse.to_fraction),
+    ("display_number", "display_number", parse.to_fraction),
+    ("unit", "unit", None),
+    ("item", "item", None),
+    ("descriptor", "descriptor", None),
+    ("display_unit", "display_unit", None),
+    ("display_item", "display_item", None),
+    ("list", "list", None),
+    ("scale", "scale", parse.to_fraction),
+    ("cost", "explicit_cost", None),
+    ("nutrition", "explicit_nutrition", nutrition.read),
+    ("recipe", "recipe_slug", None),
+)
+
+# Ingredient fields whose display version falls back to the field itself
+_DISPLAY_FIELDS = (
+    ("number", "display_number"),
+    ("unit", "display_unit"),
+    ("item", "display_item"),
+)
+
+
 def _read_ingredient(data: dict | str, list_name: Optional[str] = None) -> dict:
     """Formats ingredient data from input file."""
 
-    if not isinstance(data, (str, dict)):
+    if isinstance(data, str):
+        return _read_text_ingredient(data, list_name)
+    if not isinstance(data, dict):
         raise TypeError("Ingredient must be a string or dictionary.")
 
-    data_dict: Dict[str, Any]
-    if isinstance(data, str):
-        data_dict = {"text": data}
-    else:  # dict
-        data_dict = data
+    data_dict: Dict[str, Any] = data
 
     # default values
     ingredient = {
@@ -134,41 +171,35 @@ def _read_ingredient(data: dict | str, list_name: Optional[str] = None) -> dict:
     if list_name is not None:
         ingredient["list"] = list_name
 
-    # update number fields
-    for field in ["number", "display_number"]:
-        if field in data_dict:
-            ingredient[field] = parse.to_fraction(data_dict[field])
-
-    # update text fields
-    for field in [
-        "unit",
-        "item",
-        "descriptor",
-        "display_unit",
-        "display_item",
-        "list",
-        "scale",
-    ]:
-        if field in data_dict:
-            ingredient[field] = data_dict[field]
-
-    # update custom fields
-    if "cost" in data_dict:
-        ingredient["explicit_cost"] = data_dict["cost"]
-    if "nutrition" in data_dict:
-        ingredient["explicit_nutrition"] = nutrition.read(data_dict["nutrition"])
-    if "recipe" in data_dict:
-        ingredient["recipe_slug"] = data_dict["recipe"]
+    for field, key, convert in _INGREDIENT_FIELDS:
+        value = data_dict.get(field, _MISSING)
+        if value is not _MISSING:
+            ingredient[key] = value if convert is None else convert(value)
 
     # fill display fields if not set
-    for field in ["number", "unit", "item"]:
-        display = "display_" + field
+    for field, display in _DISPLAY_FIELDS:
         if not ingredient[display]:
             ingredient[display] = ingredient[field]
 
     return ingredient
 
 
+def _read_text_ingredient(text: str, list_name: Optional[str] = None) -> dict:
+    """Formats an ingredient given as plain text.
+
+    Specialized version of _read_ingredient for the most common input,
+    where there are no explicit fields to merge, so display fields are
+    copied straight from the parsed text.
+    """
+
+    ingredient = parse.ingredient(text)
+    ingredient["display_number"] = ingredient["number"]
+    ingredient["display_unit"] = ingredient["unit"]
+    ingredient["display_item"] = ingredient["item"]
+    ingredient["list"] = "Ingredients" if list_name is None else list_name
+    return ingredient
+
+
 def set_title(recipe):
     """Sets values related to the recipe's title and subtitle.
 
@@ -255,34 +286,64 @@ def set_scales(recipe):
     - 'keyboard_shortcut' (str)
     """
 
-    recipe["scales"] = [{"multiplier": Fraction(1)}]
-    for scale in recipe["file"].get("scale", []):
-        recipe["scales"].append({"multiplier": _read_multiplier(scale)})
-    # return scales
+    recipe["scales"] = [{"multiplier": _FRACTION_ONE}]
+    recipe["scales"].extend(
+        {"multiplier": _read_multiplier(scale)}
+        for scale in recipe["file"].get("scale", [])
+    )
 
     for i, scale in enumerate(recipe["scales"], 1):
-        label = str(scale["multiplier"].limit_denominator(100)).replace("/", "_") + "x"
-        scale["label"] = label
-        scale["item_class"] = f"scale-{label}"
-        scale["select_class"] = f"display-scale-{label}"
-        scale["button_class"] = f"display-scale-{label}-btn"
-        scale["js_function_name"] = f"scale{label}"
+        (
+            scale["label"],
+            scale["item_class"],
+            scale["select_class"],
+            scale["button_class"],
+            scale["js_function_name"],
+        ) = _scale_names(scale["multiplier"])
         scale["keyboard_shortcut"] = i
     recipe["has_scales"] = len(recipe["scales"]) > 1
     recipe["base_select_class"] = recipe["scales"][0]["select_class"]
     return recipe
 
 
+@lru_cache(maxsize=None)
+def _scale_names(multiplier: Fraction) -> tuple[str, str, str, str, str]:
+    """Returns the label, CSS classes, and JS function name for a scale.
+
+    Recipes reuse a few multipliers (1x, 2x, ½x), so the strings are
+    built once per multiplier.
+    """
+
+    label = str(multiplier.limit_denominator(100)).replace("/", "_") + "x"
+    return (
+        label,
+        f"scale-{label}",
+        f"display-scale-{label}",
+        f"display-scale-{label}-btn",
+        f"scale{label}",
+    )
+
+
+@singledispatch
 def _read_multiplier(scale) -> Fraction:
     """Returns multiplier of a scale."""
 
-    if not isinstance(scale, (int, float, str, dict)):
-        raise TypeError("Scale must be a dict or number.")
+    raise TypeError("Scale must be a dict or number.")
+
+
+@_read_multiplier.register(int)
+@_read_multiplier.register(float)
+@_read_multiplier.register(str)
+def _read_multiplier_number(scale) -> Fraction:
+    """Scale given as a number or number-like string."""
+
+    return parse.to_fraction(scale)
 
-    if isinstance(scale, (int, float, str)):
-        return parse.to_fraction(scale)
 
-    # dict
+@_read_multiplier.register(dict)
+def _read_multiplier_dict(scale) -> Fraction:
+    """Scale given as a dict with a multiplier."""
+
     return parse.to_fraction(scale["multiplier"])
 
 
@@ -298,10 +359,7 @@ def set_times(recipe):
     - 'time_string' (str)
     """
 
-    recipe["times"] = []
-
-    for time in recipe["file"].get("times", []):
-        recipe["times"].append(_read_time(time))
+    recipe["times"] = [_read_time(time) for time in recipe["file"].get("times", ())]
 
     for scale in recipe["scales"]:
         scale["times"] = recipe["times"]
@@ -317,26 +375,28 @@ def _read_time(time_data: dict) -> dict:
         raise TypeError("time must be a dict.")
     if "name" not in time_data:
         raise KeyError("time must have a name.")
-    if not isinstance(time_data["name"], str):
-        raise TypeError("time name must be a string.")
     if "time" not in time_data:
         raise KeyError("time must have a time.")
-    if not isinstance(time_data["time"], (int, float)):
-        raise TypeError(f'time time is a {type(time_data["time"])}, not a number.')
-    if not isinstance(time_data.get("unit", ""), str):
-        raise TypeError(f'time unit is a {type(time_data["unit"])}, not a string.')
 
     name = time_data["name"]
-    time_time = parse.to_fraction(time_data["time"])
-    default_unit = "minutes" if time_time > 1 else "minute"
-    time = {
+    number = time_data["time"]
+    unit = time_data.get("unit", "")
+    if not isinstance(name, str):
+        raise TypeError("time name must be a string.")
+    if not isinstance(number, (int, float)):
+        raise TypeError(f"time time is a {type(number)}, not a number.")
+    if not isinstance(unit, str):
+        raise TypeError(f"time unit is a {type(unit)}, not a string.")
+
+    time_time = parse.to_fraction(number)
+    if "unit" not in time_data:
+        unit = "minutes" if time_time > 1 else "minute"
+    return {
         "name": name,
         "time": time_time,
-        "unit": time_data.get("unit", default_unit),
+        "unit": unit,
+        "time_string": f"{parse.fraction_to_string(time_time)} {unit}",
     }
-    time["time_string"] = f'{parse.fraction_to_string(time_time)} {time["unit"]}'
-
-    return time_data
 
 
 def scale_yields(recipe):
@@ -485,8 +545,9 @@ def set_ingredients_type(recipe):
     """
 
     for ingredient in recipe["ingredients"]:
-        ingredient["is_recipe"] = "recipe_slug" in ingredient
-        ingredient["is_grocery"] = not ingredient["is_recipe"]
+        is_recipe = "recipe_slug" in ingredient
+        ingredient["is_recipe"] = is_recipe
+        ingredient["is_grocery"] = not is_recipe
     return recipe
 
 
@@ -518,7 +579,7 @@ def _ingredients_in_scale(base_ingredients, multiplier) -> list:
     for ingredient in base_ingredients:
         if "scale" not in ingredient:
             ingredients.append(_multiply_ingredient(ingredient, multiplier))
-        elif parse.to_fraction(ingredient["scale"]) == multiplier:
+        elif ingredient["scale"] == multiplier:
             ingredients.append(ingredient)
     return ingredients
 
@@ -758,14 +819,14 @@ def set_instructions(recipe):
     - 'has_instructions' (bool)
     """
 
+    # steps are numbered per scale, so only share them when there is one scale
+    shared = len(recipe["scales"]) == 1
     for scale in recipe["scales"]:
-        scale["instructions"] = []
-        for step in recipe["instructions"]:
-            if (
-                "scale" not in step
-                or parse.to_fraction(step["scale"]) == scale["multiplier"]
-            ):
-                scale["instructions"].append(step.copy())
+        scale["instructions"] = [
+            step if shared else step.copy()
+            for step in recipe["instructions"]
+            if "scale" not in step or step["scale"] == scale["multiplier"]
+        ]
 
         scale["has_instructions"] = bool(scale["instructions"])
 
@@ -778,9 +839,21 @@ def set_instruction_lists(recipe):
     """Groups instruction steps into step lists."""
 
     for scale in recipe["scales"]:
-        scale["instruction_lists"] = defaultdict(list)
-        for step in scale["instructions"]:
-            scale["instruction_lists"][step["list"]].append(step)
+        steps = scale["instructions"]
+        if not steps:
+            scale["instruction_lists"] = {}
+            continue
+
+        # most recipes have a single list, which needs no grouping
+        first_list = steps[0]["list"]
+        if all(step["list"] == first_list for step in steps):
+            scale["instruction_lists"] = {first_list: steps}
+            continue
+
+        instruction_lists = {}
+        for step in steps:
+            instruction_lists.setdefault(step["list"], []).append(step)
+        scale["instruction_lists"] = instruction_lists
     return recipe
 
 
@@ -808,9 +881,7 @@ def set_sources(recipe: dict) -> dict:
     if not isinstance(sources_data, (list)):
         raise TypeError("Sources must be a list.")
 
-    recipe["sources"] = []
-    for source_data in sources_data:
-        recipe["sources"].append(_read_source(source_data))
+    recipe["sources"] = [_read_source(source_data) for source_data in sources_data]
 
     recipe["has_sources"] = bool(recipe["sources"])
 
@@ -829,22 +900,24 @@ def _read_source(source_data):
     if not name and not url:
         raise ValueError("Source must have name or url.")
 
-    source = {}
-    if name:
-        source["name"] = name
-    if url:
-        source["url"] = url
-
-    if name and url:
-        source["html"] = f'<a href="{url}" target="_blank">{name}</a>'
-    elif not name and url:
-        source["html"] = f'<a href="{url}" target="_blank">{urlparse(url).netloc}</a>'
-    else:  # name and not url:
-        source["html"] = name
+    if not url:
+        return {"name": name, "html": name}
 
+    # link text falls back to the site's domain
+    link_text = name or _netloc(url)
+    source = {"name": name} if name else {}
+    source["url"] = url
+    source["html"] = f'<a href="{url}" target="_blank">{link_text}</a>'
     return source
 
 
+@lru_cache(maxsize=1024)
+def _netloc(url: str) -> str:
+    """Returns the domain of a source url, memoized across recipes."""
+
+    return urlparse(url).netloc
+
+
 def set_notes(recipe):
     """Set notes for each scale.
 
@@ -858,9 +931,7 @@ def set_notes(recipe):
     if not isinstance(notes_data, list):
         raise TypeError("Notes must be a list.")
 
-    recipe["notes"] = []
-    for note_data in notes_data:
-        recipe["notes"].append(_read_note(note_data))
+    recipe["notes"] = [_read_note(note_data) for note_data in notes_data]
 
     for scale in recipe["scales"]:
         scale["notes"] = notes_for_scale(recipe["notes"], scale)
@@ -873,10 +944,10 @@ def set_notes(recipe):
 def _read_note(note_data):
     """Returns formatted note data from input file."""
 
-    if not isinstance(note_data, (dict, str)):
-        raise TypeError("Note must be a dict or str.")
     if isinstance(note_data, str):
         return {"text": note_data}
+    if not isinstance(note_data, dict):
+        raise TypeError("Note must be a dict or str.")
     if "text" not in note_data:
         raise KeyError("Note must have text.")
 
@@ -889,11 +960,11 @@ def _read_note(note_data):
 def notes_for_scale(notes, scale) -> list:
     """Returns notes for a scale."""
 
-    scale_notes = []
-    for note in notes:
-        if "scale" not in note or note["scale"] == scale["multiplier"]:
-            scale_notes.append(note)
-    return scale_notes
+    return [
+        note
+        for note in notes
+        if "scale" not in note or note["scale"] == scale["multiplier"]
+    ]
 
 
 def set_videos(recipe):
@@ -968,13 +1039,14 @@ def set_schema(recipe):
     if recipe["has_image"]:
         schema["image"] = recipe["image"]
 
-    if servings_schema(recipe):
-        schema["recipeYield"] = servings_schema(recipe)
+    recipe_yield = servings_schema(recipe)
+    if recipe_yield:
+        schema["recipeYield"] = recipe_yield
 
     if recipe["scales"][0]["has_ingredients"]:
-        schema["recipeIngredient"] = []
-        for ingredient in recipe["scales"][0]["ingredients"]:
-            schema["recipeIngredient"].append(ingredient["string"])
+        schema["recipeIngredient"] = [
+            ingredient["string"] for ingredient in recipe["scales"][0]["ingredients"]
+        ]
 
     recipe["schema_string"] = json.dumps(schema)
     return recipe
@@ -998,45 +1070,53 @@ def set_search_targets(recipe):
     - 'search_targets' (list)
     """
 
-    recipe["search_targets"] = []
-    recipe["search_targets"].append({"text": recipe["title"], "type": "title"})
-
-    # subtitle
+    targets = [_search_target(recipe["title"], "title")]
     if recipe["has_subtitle"]:
-        recipe["search_targets"].append(
-            {"text": recipe["subtitle"], "type": "subtitle"}
-        )
-
-    # ingredient
-    for ingredient in recipe["scales"][0]["ingredients"]:
-        recipe["search_targets"].append(
-            {"text": ingredient["display_item"], "type": "ingredient"}
-        )
+        targets.append(_search_target(recipe["subtitle"], "subtitle"))
 
-    # ingredient tags
+    # ingredient tags follow every ingredient, but are collected in the same pass
+    tag_targets = []
     for ingredient in recipe["scales"][0]["ingredients"]:
+        item = ingredient["display_item"]
+        targets.append(_search_target(item, "ingredient"))
         if "grocery" in ingredient:
-            for tag in ingredient["grocery"]["tags"]:
-                recipe["search_targets"].append(
-                    {
-                        "text": f'{ingredient["display_item"]} ({tag})',
-                        "type": "ingredient-tag",
-                    }
-                )
-
-    for target in recipe["search_targets"]:
-        target["class"] = "target-" + target["type"]
+            tag_targets.extend(
+                _search_target(f"{item} ({tag})", "ingredient-tag")
+                for tag in ingredient["grocery"]["tags"]
+            )
+    targets.extend(tag_targets)
 
+    recipe["search_targets"] = targets
     return recipe
 
 
+_SEARCH_TARGET_CLASSES = {
+    "title": "target-title",
+    "subtitle": "target-subtitle",
+    "ingredient": "target-ingredient",
+    "ingredient-tag": "target-ingredient-tag",
+}
+
+
+def _search_target(text: str, target_type: str) -> dict:
+    """Returns a search target with its CSS class."""
+
+    return {
+        "text": text,
+        "type": target_type,
+        "class": _SEARCH_TARGET_CLASSES[target_type],
+    }
+
+
 def set_special_cases(recipe):
     """Checks input file for special cases."""
 
-    if "cost" in recipe["file"]:
-        recipe["explicit_cost"] = recipe["file"]["cost"]
-    if "nutrition" in recipe["file"]:
-        recipe["explicit_nutrition"] = nutrition.read(recipe["file"]["nutrition"])
+    cost = recipe["file"].get("cost", _MISSING)
+    if cost is not _MISSING:
+        recipe["explicit_cost"] = cost
+    nutrition_data = recipe["file"].get("nutrition", _MISSING)
+    if nutrition_data is not _MISSING:
+        recipe["explicit_nutrition"] = nutrition.read(nutrition_data)
 
     default_hide_cost = utils.config("default", "hide_cost", as_boolean=True)
     recipe["hide_cost"] = bool(recipe["file"].get("hide_cost", default_hide_cost))
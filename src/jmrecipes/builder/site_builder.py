@@ -1,7 +1,8 @@
 """Site Builder Utilities"""
 
-from collections import defaultdict
-import math
+from collections import defaultdict, deque
+from operator import itemgetter
+from typing import Optional
 
 from jmrecipes.utils import grocery
 from jmrecipes.utils import units
@@ -37,24 +38,53 @@ def set_recipes_used_in(site):
     for recipe in site["recipes"]:
         recipe["used_in_any"] = False
 
+    by_slug = recipes_by_slug(site["recipes"])
     for parent_recipe, ingredient in ingredients_in(site, include="r"):
         if ingredient["is_recipe"]:
-            child_recipe = recipe_from_slug(ingredient["recipe_slug"], site["recipes"])
+            child_recipe = recipe_from_slug(ingredient["recipe_slug"], by_slug)
             child_recipe["used_in_any"] = True
             child_recipe = add_used_in(child_recipe, parent_recipe)
 
-    # remove duplicates
+    # remove duplicates, keeping parents in the order they were found
     for recipe in site["recipes"]:
         if recipe["used_in_any"]:
-            recipe["used_in"] = [
-                dict(t) for t in {tuple(d.items()) for d in recipe["used_in"]}
-            ]
+            recipe["used_in"] = _unique_dicts(recipe["used_in"])
 
     return site
 
 
+def _unique_dicts(dicts: list[dict]) -> list[dict]:
+    """Returns the dictionaries without duplicates, in their original order."""
+
+    seen = set()
+    unique = []
+    for d in dicts:
+        key = frozenset(d.items())
+        if key not in seen:
+            seen.add(key)
+            unique.append(d)
+    return unique
+
+
+def recipes_by_slug(recipes) -> dict:
+    """Returns recipes keyed by url slug."""
+
+    return {recipe["url_slug"]: recipe for recipe in recipes}
+
+
 def recipe_from_slug(slug, recipes):
-    """Returns recipe dictionary that matches slug."""
+    """Returns recipe dictionary that matches slug.
+
+    Args:
+        slug: Recipe url slug.
+        recipes: Recipes keyed by slug (see recipes_by_slug), or a list of recipes.
+    """
+
+    if isinstance(recipes, dict):
+        try:
+            return recipes[slug]
+        except KeyError:
+            raise ValueError(f"Could not find recipe with slug: {slug}") from None
 
     for recipe in recipes:
         if recipe["url_slug"] == slug:
@@ -82,9 +112,10 @@ def set_ingredient_as_recipe_quantities(site):
     - 'recipe_quantity' (float)
     """
 
+    by_slug = recipes_by_slug(site["recipes"])
     for ingredient in ingredients_in(site):
         if ingredient["is_recipe"]:
-            set_recipe_quantity(ingredient, site["recipes"])
+            set_recipe_quantity(ingredient, by_slug)
     return site
 
 
@@ -103,12 +134,15 @@ def recipe_quantity(amount, unit, recipe) -> float:
     Returns 0 if no compatible yields.
     """
 
+    # the ingredient's unit is the same for every yield
+    unit_is_volume = units.is_volume(unit)
+    unit_is_weight = units.is_weight(unit)
     for yielb in recipe["yield"]:
         yield_unit = yielb["unit"]
         if (
-            units.is_volume(unit)
+            unit_is_volume
             and units.is_volume(yield_unit)
-            or units.is_weight(unit)
+            or unit_is_weight
             and units.is_weight(yield_unit)
         ):
             return (
@@ -122,6 +156,60 @@ def recipe_quantity(amount, unit, recipe) -> float:
     return 0
 
 
+def recipes_in_dependency_order(recipes, final_key: Optional[str] = None) -> list:
+    """Returns recipes ordered so child recipes come before their parents.
+
+    Uses Kahn's algorithm. Recipes in a reference cycle, or that use a
+    missing recipe, cannot be ordered and are placed last in site order.
+
+    Args:
+        recipes: Recipes to order.
+        final_key: Key such as 'cost_final'. Parent ingredients that are
+            already final, and child recipes whose first scale is already
+            final, are not waited on, so explicit values on either can
+            break a reference cycle.
+    """
+
+    by_slug = recipes_by_slug(recipes)
+    parent_values = {"is_recipe": True}
+    if final_key is not None:
+        parent_values[final_key] = False
+
+    pending_children = {}
+    parents = defaultdict(list)
+    for recipe in recipes:
+        child_slugs = {
+            ingredient["recipe_slug"]
+            for ingredient in ingredients_in(recipe, values=parent_values)
+            if not _is_final(by_slug.get(ingredient["recipe_slug"]), final_key)
+        }
+        pending_children[recipe["url_slug"]] = len(child_slugs)
+        for child_slug in child_slugs:
+            parents[child_slug].append(recipe)
+
+    ready = deque(r for r in recipes if not pending_children[r["url_slug"]])
+    ordered = []
+    while ready:
+        recipe = ready.popleft()
+        ordered.append(recipe)
+        for parent in parents[recipe["url_slug"]]:
+            pending_children[parent["url_slug"]] -= 1
+            if not pending_children[parent["url_slug"]]:
+                ready.append(parent)
+
+    if len(ordered) < len(recipes):
+        ordered.extend(r for r in recipes if pending_children[r["url_slug"]])
+    return ordered
+
+
+def _is_final(recipe: Optional[dict], final_key: Optional[str]) -> bool:
+    """True if the recipe's first scale is already final for final_key."""
+
+    if recipe is None or final_key is None:
+        return False
+    return recipe["scales"][0][final_key]
+
+
 def set_costs(site):
     """Set costs for each ingredients and recipe scale.
 
@@ -134,10 +222,14 @@ def set_costs(site):
     - 'cost_final' (bool)
     """
 
-    for ingredient in ingredients_in(site):
+    # the site's structure is fixed here, so flatten it once for every pass
+    ingredients = ingredients_in(site)
+    scales = scales_in(site)
+
+    for ingredient in ingredients:
         ingredient["cost_final"] = False
 
-    for scale in scales_in(site):
+    for scale in scales:
         scale["cost_final"] = False
 
     for ingredient in ingredients_in(site, keys="explicit_cost"):
@@ -160,51 +252,55 @@ def set_costs(site):
             scale["cost"] = recipe["explicit_cost"] * scale["multiplier"]
             scale["cost_final"] = True
 
-    while recipes_cost_pending_count(site):
-        calculate_ingredient_costs(site)
-        pre_pending_count = recipes_cost_pending_count(site)
-        calculate_recipe_costs(site)
-        post_pending_count = recipes_cost_pending_count(site)
-        if pre_pending_count == post_pending_count:
-            raise ValueError("Cyclic recipe reference found")
+    # child recipes come first, so one pass finalizes every acyclic recipe
+    by_slug = recipes_by_slug(site["recipes"])
+    # explicit ingredient costs are final already and are never replaced
+    for recipe in recipes_in_dependency_order(site["recipes"], "cost_final"):
+        parent_ingredients = ingredients_in(
+            recipe, values={"is_recipe": True, "cost_final": False}
+        )
+        calculate_ingredient_costs(parent_ingredients, by_slug)
+        calculate_recipe_costs(recipe["scales"])
+
+    if recipes_cost_pending_count(scales):
+        raise ValueError("Cyclic recipe reference found")
 
     return site
 
 
-def recipes_cost_pending_count(site) -> int:
+def recipes_cost_pending_count(scales) -> int:
     """Number of recipe scales where cost_final is False."""
 
-    count = 0
-    for scale in scales_in(site):
-        if not scale["cost_final"]:
-            count += 1
-    return count
+    return sum(not scale["cost_final"] for scale in scales)
 
 
-def calculate_ingredient_costs(site) -> None:
+def calculate_ingredient_costs(parent_ingredients, by_slug) -> None:
     """Tries to calculate costs of parent ingredients.
 
     Sets ingredient cost if child recipe's cost is final.
+
+    Args:
+        parent_ingredients: Ingredients that are recipes.
+        by_slug: Recipes keyed by slug (see recipes_by_slug).
     """
 
-    for ingredient in ingredients_in(site):
-        if ingredient["is_recipe"]:
-            child_recipe = recipe_from_slug(ingredient["recipe_slug"], site["recipes"])
-            if child_recipe["scales"][0]["cost_final"]:
-                ingredient["recipe_cost"] = child_recipe["scales"][0]["cost"]
-                ingredient["cost"] = (
-                    ingredient["recipe_quantity"] * ingredient["recipe_cost"]
-                )
-                ingredient["cost_final"] = True
+    for ingredient in parent_ingredients:
+        child_recipe = recipe_from_slug(ingredient["recipe_slug"], by_slug)
+        if child_recipe["scales"][0]["cost_final"]:
+            ingredient["recipe_cost"] = child_recipe["scales"][0]["cost"]
+            ingredient["cost"] = (
+                ingredient["recipe_quantity"] * ingredient["recipe_cost"]
+            )
+            ingredient["cost_final"] = True
 
 
-def calculate_recipe_costs(site) -> None:
+def calculate_recipe_costs(scales) -> None:
     """Tries to calculate costs of recipes.
 
     Sets recipe cost if all ingredients' costs are final.
     """
 
-    for scale in scales_in(site):
+    for scale in scales:
         if not scale["cost_final"] and ingredients_costs_final(scale):
             scale["cost"] = sum_ingredient_cost(scale)
             scale["cost_final"] = True
@@ -222,10 +318,7 @@ def ingredients_costs_final(scale):
 def sum_ingredient_cost(scale) -> float:
     """Returns the cost of a scale by adding each ingredient."""
 
-    cost = 0
-    for ingredient in scale["ingredients"]:
-        cost += ingredient["cost"]
-    return cost
+    return sum(ingredient["cost"] for ingredient in scale["ingredients"])
 
 
 def set_costs_per_serving(site):
@@ -296,9 +389,13 @@ def set_nutrition(site):
     - 'has_nutrition' (bool)
     """
 
-    for ingredient in ingredients_in(site):
+    # the site's structure is fixed here, so flatten it once for every pass
+    ingredients = ingredients_in(site)
+    scales = scales_in(site)
+
+    for ingredient in ingredients:
         ingredient["nutrition_final"] = False
-    for scale in scales_in(site):
+    for scale in scales:
         scale["nutrition_final"] = False
 
     for ingredient in ingredients_in(site, keys="explicit_nutrition"):
@@ -326,52 +423,56 @@ def set_nutrition(site):
             )
             scale["nutrition_final"] = True
 
-    while recipes_nutrition_pending_count(site):
-        calculate_ingredient_nutrition(site)
-        pre_pending_count = recipes_nutrition_pending_count(site)
-        calculate_recipes_nutrition(site)
-        post_pending_count = recipes_nutrition_pending_count(site)
-        if pre_pending_count == post_pending_count:
-            raise ValueError("Recipe loop found")
+    # child recipes come first, so one pass finalizes every acyclic recipe
+    by_slug = recipes_by_slug(site["recipes"])
+    # explicit ingredient nutrition is final already and is never replaced
+    for recipe in recipes_in_dependency_order(site["recipes"], "nutrition_final"):
+        parent_ingredients = ingredients_in(
+            recipe, values={"is_recipe": True, "nutrition_final": False}
+        )
+        calculate_ingredient_nutrition(parent_ingredients, by_slug)
+        calculate_recipes_nutrition(recipe["scales"])
+
+    if recipes_nutrition_pending_count(scales):
+        raise ValueError("Recipe loop found")
 
     return site
 
 
-def recipes_nutrition_pending_count(site) -> int:
+def recipes_nutrition_pending_count(scales) -> int:
     """Number of recipe scales where nutrition_final is False."""
 
-    count = 0
-    for scale in scales_in(site):
-        if not scale["nutrition_final"]:
-            count += 1
-    return count
+    return sum(not scale["nutrition_final"] for scale in scales)
 
 
-def calculate_ingredient_nutrition(site) -> None:
+def calculate_ingredient_nutrition(parent_ingredients, by_slug) -> None:
     """Tries to calculate nutrition of parent ingredients.
 
     Sets ingredient nutrition if child recipe's nutrition is final.
+
+    Args:
+        parent_ingredients: Ingredients that are recipes.
+        by_slug: Recipes keyed by slug (see recipes_by_slug).
     """
 
-    for ingredient in ingredients_in(site):
-        if ingredient["is_recipe"]:
-            child_recipe = recipe_from_slug(ingredient["recipe_slug"], site["recipes"])
-            if child_recipe["scales"][0]["nutrition_final"]:
-                ingredient["recipe_nutrition"] = child_recipe["scales"][0]["nutrition"]
-                ingredient["nutrition"] = nutrition.multiply(
-                    ingredient["recipe_nutrition"], ingredient["recipe_quantity"]
-                )
-                ingredient["has_nutrition"] = True
-                ingredient["nutrition_final"] = True
+    for ingredient in parent_ingredients:
+        child_recipe = recipe_from_slug(ingredient["recipe_slug"], by_slug)
+        if child_recipe["scales"][0]["nutrition_final"]:
+            ingredient["recipe_nutrition"] = child_recipe["scales"][0]["nutrition"]
+            ingredient["nutrition"] = nutrition.multiply(
+                ingredient["recipe_nutrition"], ingredient["recipe_quantity"]
+            )
+            ingredient["has_nutrition"] = True
+            ingredient["nutrition_final"] = True
 
 
-def calculate_recipes_nutrition(site):
+def calculate_recipes_nutrition(scales):
     """Tries to calculate nutrition of recipes.
 
     Sets recipe nutrition if all ingredients' nutritions are final.
     """
 
-    for scale in scales_in(site):
+    for scale in scales:
         if not scale["nutrition_final"] and ingredients_nutrition_final(scale):
             scale["nutrition"] = sum_ingredient_nutrition(scale)
             scale["nutrition_final"] = True
@@ -389,13 +490,19 @@ def ingredients_nutrition_final(scale):
 def sum_ingredient_nutrition(scale) -> dict:
     """Returns the nutrition of a scale by adding each ingredient."""
 
-    recipe_nutrition = empty_nutrition()
+    calories = fat = carbohydrates = protein = 0
     for ingredient in scale["ingredients"]:
-        recipe_nutrition["calories"] += ingredient["nutrition"]["calories"]
-        recipe_nutrition["fat"] += ingredient["nutrition"]["fat"]
-        recipe_nutrition["protein"] += ingredient["nutrition"]["protein"]
-        recipe_nutrition["carbohydrates"] += ingredient["nutrition"]["carbohydrates"]
-    return recipe_nutrition
+        ingredient_nutrition = ingredient["nutrition"]
+        calories += ingredient_nutrition["calories"]
+        fat += ingredient_nutrition["fat"]
+        carbohydrates += ingredient_nutrition["carbohydrates"]
+        protein += ingredient_nutrition["protein"]
+    return {
+        "calories": calories,
+        "fat": fat,
+        "carbohydrates": carbohydrates,
+        "protein": protein,
+    }
 
 
 def empty_nutrition() -> dict:
@@ -553,9 +660,21 @@ def set_ingredient_lists(site):
     """
 
     for scale in scales_in(site):
-        scale["ingredient_lists"] = defaultdict(list)
-        for ingredient in scale["ingredients"]:
-            scale["ingredient_lists"][ingredient["list"]].append(ingredient)
+        ingredients = scale["ingredients"]
+        if not ingredients:
+            scale["ingredient_lists"] = {}
+            continue
+
+        # most recipes have a single list, which needs no grouping
+        first_list = ingredients[0]["list"]
+        if all(ingredient["list"] == first_list for ingredient in ingredients):
+            scale["ingredient_lists"] = {first_list: ingredients}
+            continue
+
+        ingredient_lists = {}
+        for ingredient in ingredients:
+            ingredient_lists.setdefault(ingredient["list"], []).append(ingredient)
+        scale["ingredient_lists"] = ingredient_lists
     return site
 
 
@@ -572,35 +691,49 @@ def link_recipes_collections(site):
     for recipe in site["recipes"]:
         recipe["collections"] = []
 
+    by_slug = recipes_by_slug(site["recipes"])
     for collection in site["collections"]:
+        # read-only, so every recipe in the collection shares one copy
+        collection_info = info_for_recipe(collection)
         for i, url_slug in enumerate(collection["recipes"]):
-            for recipe in site["recipes"]:
-                if recipe["url_slug"] == url_slug:
-                    recipe["collections"].append(info_for_recipe(collection))
-                    collection["recipes"][i] = info_for_collection(recipe)
+            recipe = by_slug.get(url_slug)
+            if recipe is not None:
+                recipe["collections"].append(collection_info)
+                collection["recipes"][i] = info_for_collection(recipe)
 
     return site
 
 
+# Keys every recipe/collection has; optional keys are copied separately.
+_COLLECTION_INFO_KEYS = (
+    "title",
+    "url_slug",
+    "has_subtitle",
+    "image_url",
+    "search_targets",
+)
+_get_collection_info = itemgetter(*_COLLECTION_INFO_KEYS)
+
+_RECIPE_INFO_KEYS = ("name", "url_path", "href")
+_get_recipe_info = itemgetter(*_RECIPE_INFO_KEYS)
+
+
 def info_for_collection(recipe) -> dict:
     """Recipe data needed for collection page."""
 
-    keys = (
-        "title",
-        "url_slug",
-        "subtitle",
-        "has_subtitle",
-        "image_url",
-        "search_targets",
-    )
-    return {k: recipe[k] for k in keys if k in recipe}
+    info = dict(zip(_COLLECTION_INFO_KEYS, _get_collection_info(recipe)))
+    if recipe["has_subtitle"]:
+        info["subtitle"] = recipe["subtitle"]
+    return info
 
 
 def info_for_recipe(collection) -> dict:
     """Collection data needed for recipe page."""
 
-    keys = ("name", "url_path", "label", "href")
-    return {k: collection[k] for k in keys if k in collection}
+    info = dict(zip(_RECIPE_INFO_KEYS, _get_recipe_info(collection)))
+    if "label" in collection:
+        info["label"] = collection["label"]
+    return info
 
 
 def set_search_values(site) -> dict:
@@ -617,8 +750,9 @@ def set_search_values(site) -> dict:
         for i, recipe in enumerate(collection["recipes"], 1):
             recipe["index"] = i
 
+        # smallest power of ten that is at least the count, in integer math
         count = len(collection["recipes"])
-        interval = 10 ** math.ceil(math.log10(count)) if count > 0 else 1
+        interval = 10 ** len(str(count - 1)) if count > 1 else 1
         collection["search_group_interval"] = interval
 
     return site
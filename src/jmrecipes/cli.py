@@ -20,8 +20,13 @@ def main():
     build_parser.add_argument(
         "--data", type=str, help="Directory with recipe input data"
     )
+    build_parser.add_argument(
+        "--log",
+        action="store_true",
+        help="Save data after each build step in builds/latest/build-log",
+    )
 
     args = parser.parse_args()
     if args.command == "build":
         init_paths(data_dir=args.data)
-        build()
+        build(log=args.log)
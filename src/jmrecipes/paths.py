@@ -35,6 +35,11 @@ class PathConfig:
         """Return the directory where generated builds are written."""
         return self.project_dir / "builds"
 
+    @property
+    def cache_dir(self) -> Path:
+        """Return the directory for build caches reused across builds."""
+        return self.builds_dir / ".cache"
+
     @property
     def templates_dir(self) -> Path:
         """Return the directory containing HTML templates."""
@@ -76,6 +81,12 @@ def init_paths(
     )
 
 
+def set_paths(paths: PathConfig) -> None:
+    """Install an existing path configuration, e.g. in a worker process."""
+    global _paths  # pylint: disable=global-statement
+    _paths = paths
+
+
 def get_paths() -> PathConfig:
     """Return path configuration."""
     if _paths is None:
@@ -10,9 +10,9 @@ from jmrecipes.utils import parse
 def lookup(ingredient_name: str) -> dict | None:
     """Look up grocery information for a given ingredient name.
 
-    This function searches the `_groceries` DataFrame for a row
-    matching the lowercase version of the provided ingredient name.
-    If found, it returns the row as a dictionary.
+    This function finds the first grocery whose lowercase name matches
+    the lowercase version of the provided ingredient name. If found, it
+    returns the row as a dictionary.
 
     Args:
         ingredient_name (str): The name of the ingredient to look up.
@@ -22,16 +22,10 @@ def lookup(ingredient_name: str) -> dict | None:
         is found, otherwise None.
     """
 
-    _groceries = _get_groceries()
-    matching_items = _groceries[_groceries.name.str.lower() == ingredient_name.lower()]
-
-    if matching_items.empty:
+    grocery_dict = _get_index().get(ingredient_name.lower())
+    if grocery_dict is None:
         return None
-
-    matching_item = matching_items.iloc[0]
-    grocery_dict = matching_item.to_dict()
-
-    return grocery_dict
+    return grocery_dict.copy()
 
 
 def full_list() -> list[dict]:
@@ -46,6 +40,17 @@ def _get_groceries() -> pd.DataFrame:
     return _load_groceries().copy()
 
 
+@lru_cache(maxsize=1)
+def _get_index() -> dict[str, dict]:
+    """Map each lowercase grocery name to its first matching row."""
+    groceries = _get_groceries()
+    index = {}
+    for i, name in enumerate(groceries.name.str.lower()):
+        if name not in index:
+            index[name] = groceries.iloc[i].to_dict()
+    return index
+
+
 def _load_groceries() -> pd.DataFrame:
     """Load groceries from Excel file and preprocess the data."""
     groceries = pd.read_excel(get_paths().data_dir / "groceries.xlsx")
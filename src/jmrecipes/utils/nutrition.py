@@ -29,9 +29,7 @@ def multiply(
     Returns:
         dict[str, int | float]: A new dictionary with the scaled nutrition values.
     """
-    multiplied = {key: value * multiplier for key, value in nutrition.items()}
-
     if round_result:
-        multiplied = {key: round(value) for key, value in multiplied.items()}
+        return {key: round(value * multiplier) for key, value in nutrition.items()}
 
-    return multiplied
+    return {key: value * multiplier for key, value in nutrition.items()}
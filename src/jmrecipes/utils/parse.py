@@ -1,11 +1,16 @@
 """Utilities to parse things."""
 
+from functools import lru_cache
 from math import floor
+import sys
 from fractions import Fraction
 from typing import Tuple
 
 from jmrecipes.utils import units
 
+# Fractions are immutable, so parsing can start every amount from one zero.
+_FRACTION_ZERO = Fraction(0)
+
 
 def ingredient(text: str) -> dict:
     """Parses an ingredient string into its components.
@@ -27,10 +32,23 @@ def ingredient(text: str) -> dict:
             - "descriptor" (str)
     """
 
+    number, unit, item, descriptor = _ingredient_parts(text)
+    return {"number": number, "unit": unit, "item": item, "descriptor": descriptor}
+
+
+@lru_cache(maxsize=None)
+def _ingredient_parts(text: str) -> Tuple[Fraction, str, str, str]:
+    """Cached parse of ingredient text into number, unit, item, descriptor.
+
+    Returns an immutable tuple so callers get a fresh dict every time
+    and cannot modify the cached result.
+    """
+
     number, other = _split_fraction_and_text(text)
     unit, other = _split_unit_and_other(other)
     item, descriptor = _split_item_and_descriptor(other)
-    return {"number": number, "unit": unit, "item": item, "descriptor": descriptor}
+    # a handful of units repeat across every ingredient, so share one copy
+    return number, sys.intern(unit), item, descriptor
 
 
 def amount(text: str) -> Tuple[Fraction, str]:
@@ -39,9 +57,13 @@ def amount(text: str) -> Tuple[Fraction, str]:
     return _split_fraction_and_text(text)
 
 
+@lru_cache(maxsize=None)
 def to_fraction(number: int | float | str) -> Fraction:
     """Converts number to Fraction.
 
+    Results are cached, since Fraction objects are immutable and the
+    same amounts ("1", "1/2", 2) repeat across a site.
+
     Args:
         number: Number or number-like string. String can include mixed
         numbers and unicode fractions.
@@ -122,7 +144,7 @@ def _split_fraction_and_text(text) -> Tuple[Fraction, str]:
     for asci, unicode in _unicode_fractions.items():
         text = text.replace(unicode, " " + asci)
 
-    number = Fraction()
+    number = _FRACTION_ZERO
     words = text.split()
     remaining_words = []
     for i, word in enumerate(words):
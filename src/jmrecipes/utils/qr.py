@@ -1,10 +1,47 @@
 """QR utilities."""
 
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
 from segno import make_qr
 
+from jmrecipes.utils import utils
+
+_SCALE = 5
+_BORDER = 0
+
+
+def create(
+    link: str, filepath: str | Path, cache_dir: Optional[Path] = None
+) -> None:
+    """Create QR code file.
+
+    Args:
+        link: Link to encode.
+        filepath: Path to save the QR code PNG to.
+        cache_dir: Directory of previously encoded QR codes, keyed by link.
+            If given, a cached code is linked instead of encoding it again.
+    """
+
+    if cache_dir is None:
+        _save(link, filepath)
+        return
+
+    key = hashlib.sha256(f"{link} {_SCALE} {_BORDER}".encode()).hexdigest()
+    cached_path = cache_dir / f"{key}.png"
+    if not cached_path.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # write then rename, so other workers never see a partial file
+        temp_path = cache_dir / f"{key}.{os.getpid()}.tmp"
+        _save(link, temp_path)
+        os.replace(temp_path, cached_path)
+    utils.link_or_copy(cached_path, filepath)
+
 
-def create(link: str, filepath: str) -> None:
-    """Create QR code file."""
+def _save(link: str, filepath: str | Path) -> None:
+    """Encode a link and save it as a QR code PNG."""
 
     qr_code = make_qr(link)
-    qr_code.save(filepath, scale=5, border=0)
+    qr_code.save(filepath, kind="png", scale=_SCALE, border=_BORDER)
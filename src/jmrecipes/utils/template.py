@@ -1,6 +1,8 @@
 """Template rendering utilities and SVG icon definitions."""
 
+from functools import lru_cache
 import os
+from pathlib import Path
 import jinja2
 
 from jmrecipes.paths import get_paths
@@ -8,16 +10,33 @@ from jmrecipes.paths import get_paths
 
 def render(template_name: str, **context) -> str:
     """Render a Jinja2 template with the provided context."""
-    templates_dir = get_paths().templates_dir
+    return get_template(template_name).render(context)
 
+
+def get_template(template_name: str) -> jinja2.Template:
+    """Return a compiled Jinja2 template from the templates directory.
+
+    Templates are compiled once per process and reused for every page.
+    """
+    return _get_template(get_paths().templates_dir, template_name)
+
+
+@lru_cache(maxsize=None)
+def _get_template(templates_dir: Path, template_name: str) -> jinja2.Template:
+    """Load and compile a template, cached by directory and name."""
     try:
-        _environment = jinja2.Environment(loader=jinja2.FileSystemLoader(templates_dir))
-        template = _environment.get_template(template_name)
+        template = _environment(templates_dir).get_template(template_name)
     except jinja2.TemplateNotFound as exc:
         raise ValueError(
             f"Template '{template_name}' not found in '{templates_dir}'."
         ) from exc
-    return template.render(context)
+    return template
+
+
+@lru_cache(maxsize=None)
+def _environment(templates_dir: Path) -> jinja2.Environment:
+    """Return the Jinja2 environment for a templates directory."""
+    return jinja2.Environment(loader=jinja2.FileSystemLoader(templates_dir))
 
 
 def get_icons() -> dict:
@@ -27,8 +46,12 @@ def get_icons() -> dict:
         dict: A dictionary mapping filename stem (without extension) to SVG contents.
               Example: {'gear': '<svg>...</svg>', 'home': '<svg>...</svg>'}
     """
-    icons_dir = get_paths().icons_dir
+    return _read_icons(get_paths().icons_dir)
+
 
+@lru_cache(maxsize=None)
+def _read_icons(icons_dir: Path) -> dict:
+    """Read SVG icons from a folder, cached so each build reads them once."""
     icons = {}
 
     for filename in os.listdir(icons_dir):
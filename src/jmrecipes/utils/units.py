@@ -1,10 +1,16 @@
-"""Unit utilities for parsing, identifying, and converting units."""
+"""Unit utilities for parsing, identifying, and converting units.
 
+Unit names come from a small, fixed table, so lookups are cached by
+their arguments.
+"""
+
+from functools import lru_cache
 import pandas as pd
 
 from jmrecipes.paths import get_paths
 
 
+@lru_cache(maxsize=None)
 def is_unit(text: str) -> bool:
     """Returns True if text is a single or plural unit."""
 
@@ -19,6 +25,7 @@ def is_unit(text: str) -> bool:
     return text in units
 
 
+@lru_cache(maxsize=None)
 def is_weight(unit: str) -> bool:
     """Returns True if unit is a single or plural weight unit."""
     _units = _load_units()
@@ -30,6 +37,7 @@ def is_weight(unit: str) -> bool:
     return unit in weights
 
 
+@lru_cache(maxsize=None)
 def is_volume(unit: str) -> bool:
     """Returns True if unit is a single or plural volume unit."""
     _units = _load_units()
@@ -41,6 +49,7 @@ def is_volume(unit: str) -> bool:
     return unit in volumes
 
 
+@lru_cache(maxsize=None)
 def is_equivalent(unit1: str, unit2: str) -> bool:
     """Determines if two units are the same.
 
@@ -65,6 +74,7 @@ def is_equivalent(unit1: str, unit2: str) -> bool:
         return True
 
 
+@lru_cache(maxsize=None)
 def to_standard(unit: str):
     """Returns a unit's conversion to standard."""
     _units = _load_units()
@@ -85,6 +95,7 @@ def numberize(unit: str, number: int | float) -> str:
     return _plural(unit) if number > 1 else _single(unit)
 
 
+@lru_cache(maxsize=None)
 def _plural(unit: str) -> str:
     """Returns plural version of a unit.
 
@@ -103,6 +114,7 @@ def _plural(unit: str) -> str:
     return matching_item["plural"]
 
 
+@lru_cache(maxsize=None)
 def _single(unit: str) -> str:
     """Returns singular version of a unit.
 
@@ -121,6 +133,7 @@ def _single(unit: str) -> str:
     return matching_item["unit"]
 
 
+@lru_cache(maxsize=1)
 def _load_units() -> pd.DataFrame:
     """Loads list of units from file."""
 
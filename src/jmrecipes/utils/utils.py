@@ -1,8 +1,11 @@
 """Various utilities."""
 
+from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser
 from fractions import Fraction
+from functools import lru_cache
 import json
+import os
 from pathlib import Path
 import shutil
 from urllib.parse import urlparse, urlunparse, urlencode, parse_qs
@@ -23,11 +26,65 @@ def make_empty_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
-def write_file(content: str, path: Path):
-    """Save content to a text file."""
+def make_dirs(paths: list[Path]) -> None:
+    """Create several directories at once, keeping any that already exist.
 
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(content)
+    Creation is spread across a thread pool so mkdir latency overlaps on
+    slow or network filesystems.
+    """
+
+    with ThreadPoolExecutor() as executor:
+        list(executor.map(lambda path: os.makedirs(path, exist_ok=True), paths))
+
+
+def write_file(content: str | bytes, path: Path):
+    """Save content to a text file.
+
+    Writes UTF-8 bytes directly to a raw file descriptor, skipping the
+    text and buffering layers of open(), since pages are written whole.
+    An existing file is unlinked rather than truncated, so hard links to
+    it from earlier build snapshots keep their contents.
+    """
+
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    _unlink(path)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+    finally:
+        os.close(fd)
+
+
+def copy_file(source: str | Path, destination: str | Path) -> None:
+    """Copy a file, replacing rather than overwriting any existing file.
+
+    The copy never shares an inode with the source, so editing a data file
+    in place cannot change earlier builds, and the reverse.
+    """
+
+    _unlink(destination)
+    shutil.copyfile(source, destination)
+
+
+def link_or_copy(source: str | Path, destination: str | Path) -> None:
+    """Hard link a file, or copy it if linking is not possible."""
+
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+
+def _unlink(path: str | Path) -> None:
+    """Remove a file if it exists."""
+
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
 
 
 def write_json_file(data: dict, path: Path):
@@ -63,21 +120,21 @@ def pipe(data: dict, log_path: Path | None, *funcs: Callable[[dict], dict]) -> d
     """Pipe data through a sequence of functions.
 
     Optionally saves data after each function in log files. Saves no log
-    if log_path is None.
+    if log_path is None. The log_path directory must already exist.
     """
 
-    has_log = log_path is not None
+    if log_path is None:
+        for func in funcs:
+            data = func(data)
+        return data
 
-    if has_log:
-        log_path.mkdir(parents=True, exist_ok=True)
-        log_file_path_0 = log_path / "0_start.json"
-        write_json_file(data, log_file_path_0)
+    log_file_path_0 = log_path / "0_start.json"
+    write_json_file(data, log_file_path_0)
 
     for i, func in enumerate(funcs, 1):
         data = func(data)
-        if has_log:
-            log_file_path = log_path / f"{i}_{func.__name__}.json"
-            write_json_file(data, log_file_path)
+        log_file_path = log_path / f"{i}_{func.__name__}.json"
+        write_json_file(data, log_file_path)
 
     return data
 
@@ -86,13 +143,21 @@ def pipe(data: dict, log_path: Path | None, *funcs: Callable[[dict], dict]) -> d
 def config(section: str, name: str, as_boolean: bool = False) -> str | bool:
     """Read from config file."""
 
-    parser = ConfigParser()
-    parser.read(get_paths().config_file)
+    parser = _read_config(get_paths().config_file)
     if as_boolean:
         return parser.getboolean(section, name)
     return parser.get(section, name)
 
 
+@lru_cache(maxsize=None)
+def _read_config(config_file: Path) -> ConfigParser:
+    """Parse config file once per path."""
+
+    parser = ConfigParser()
+    parser.read(config_file)
+    return parser
+
+
 def site_title() -> str:
     """Read site title from config file."""
 
@@ -146,9 +211,22 @@ def make_url(**kwargs) -> str:
 def feedback_url(page_name: str, source_url: str) -> str:
     """Create feedback url with prefilled values."""
 
-    components = urlparse(str(config("feedback", "url")))
+    domain, path = _split_feedback_url(str(config("feedback", "url")))
     query = {"prefill_page": page_name, "prefill_source_url": source_url}
-    return make_url(domain=components[1], path=components[2], query=query)
+    return make_url(domain=domain, path=path, query=query)
+
+
+@lru_cache(maxsize=None)
+def _split_feedback_url(url: str) -> tuple[str, str]:
+    """Parse the configured feedback url into domain and path once."""
+
+    components = urlparse(url)
+    return components.netloc, components.path
+
+
+_SLUG_SEPARATORS = re.compile(r"[ _]+")
+_SLUG_INVALID = re.compile(r"[^a-z0-9\-]")
+_SLUG_DASHES = re.compile(r"-{2,}")
 
 
 def sluggify(name: str) -> str:
@@ -168,9 +246,9 @@ def sluggify(name: str) -> str:
     """
 
     slug = name.lower()
-    slug = re.sub(r"[ _]+", "-", slug)  # Replace spaces and underscores with dashes
-    slug = re.sub(r"[^a-z0-9\-]", "", slug)  # Remove invalid characters
-    slug = re.sub(r"-{2,}", "-", slug)  # Replace multiple dashes with one
+    slug = _SLUG_SEPARATORS.sub("-", slug)  # Spaces and underscores to dashes
+    slug = _SLUG_INVALID.sub("", slug)  # Remove invalid characters
+    slug = _SLUG_DASHES.sub("-", slug)  # Replace multiple dashes with one
     slug = slug.strip("-")  # Strip leading/trailing dashes
     return slug
 
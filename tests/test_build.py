@@ -0,0 +1,134 @@
+"""Unit tests for loading and building site data."""
+
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+from pathlib import Path
+import shutil
+
+import pytest
+
+from src.jmrecipes import build
+from src.jmrecipes.paths import PathConfig
+
+
+file_dir = Path(__file__).resolve().parent
+test_data = file_dir / "data"
+repo_dir = file_dir.parent
+
+
+@pytest.fixture
+def site_paths(tmp_path):
+    """Install paths to a copy of the repo data, building outside the repo."""
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    (project_dir / "src").symlink_to(repo_dir / "src")
+    data_dir = tmp_path / "data"
+    shutil.copytree(repo_dir / "data", data_dir)
+
+    old_paths = build.get_paths()
+    paths = PathConfig(project_dir, data_dir)
+    build.set_paths(paths)
+    yield paths
+    build.set_paths(old_paths)
+
+
+def build_test_site(paths: PathConfig, site_path: Path) -> None:
+    """Load the site data and build it into site_path."""
+    with ThreadPoolExecutor() as executor:
+        site = build.load_site(paths.data_dir, executor=executor)
+        build.build_site(
+            site,
+            site_path,
+            datetime.datetime.now(),
+            executor=executor,
+            manifest_path=paths.cache_dir / "manifests" / "web.json",
+        )
+
+
+def test_logged_recipes_bypass_recipe_cache(tmp_path):
+    """Test that a logged build writes recipe logs with a warm cache."""
+    recipes_dir = test_data / "site_nested_recipe_quantity" / "recipes"
+    cache_dir = tmp_path / "cache"
+    build.load_recipes(recipes_dir, cache_path=cache_dir)
+
+    log_dir = tmp_path / "log"
+    build.load_recipes(recipes_dir, log_dir, cache_dir)
+    for recipe_dir in recipes_dir.iterdir():
+        assert (log_dir / recipe_dir.name / "0_start.json").exists()
+
+
+def test_cached_site_without_collections(tmp_path):
+    """Test loading a site with no collections folder while caching."""
+    site_dir = test_data / "site_nested_recipe_quantity"
+    site = build.load_site(site_dir, cache_path=tmp_path / "cache")
+    assert site["collections"] == []
+    assert len(site["recipes"]) == 4
+
+
+def test_build_site_skips_unchanged_recipes(site_paths, tmp_path):
+    """Test that a rebuild only rewrites pages of edited recipes."""
+    site_path = tmp_path / "site"
+    build_test_site(site_paths, site_path)
+    assert not list(site_path.glob(".*manifest*"))
+    edited_page = site_path / "french-toast" / "index.html"
+    unchanged_page = site_path / "scale-pluralize" / "index.html"
+    edited_mtime = edited_page.stat().st_mtime_ns
+    unchanged_mtime = unchanged_page.stat().st_mtime_ns
+
+    build_test_site(site_paths, site_path)
+    assert edited_page.stat().st_mtime_ns == edited_mtime
+    assert unchanged_page.stat().st_mtime_ns == unchanged_mtime
+
+    recipe_file = site_paths.data_dir / "recipes" / "french-toast" / "french-toast.yaml"
+    recipe_file.write_text(
+        recipe_file.read_text().replace("French Toast", "Edited Toast", 1)
+    )
+    build_test_site(site_paths, site_path)
+    assert "Edited Toast" in edited_page.read_text()
+    assert unchanged_page.stat().st_mtime_ns == unchanged_mtime
+
+
+def test_build_site_removes_stale_pages(site_paths, tmp_path):
+    """Test that pages of removed recipes and collections are deleted."""
+    site_path = tmp_path / "site"
+    build_test_site(site_paths, site_path)
+    assert (site_path / "search-title" / "index.html").exists()
+    assert (site_path / "special" / "index.html").exists()
+
+    collections_dir = site_paths.data_dir / "collections"
+    home_file = collections_dir / "home.yaml"
+    home_file.write_text(home_file.read_text().replace("- search-title\n", ""))
+    shutil.rmtree(site_paths.data_dir / "recipes" / "search-title")
+    (collections_dir / "collection2.yaml").unlink()
+    build_test_site(site_paths, site_path)
+    assert not (site_path / "search-title").exists()
+    assert not (site_path / "special").exists()
+    assert (site_path / "french-toast" / "index.html").exists()
+    assert (site_path / "index.html").exists()
+
+
+def test_recipe_files_prefers_json(tmp_path):
+    """Test that a JSON data file is picked over a YAML one."""
+    (tmp_path / "recipe.yaml").write_text("title: YAML\n")
+    (tmp_path / "recipe.json").write_text('{"title": "JSON"}')
+    (tmp_path / "photo.jpg").write_bytes(b"")
+    assert build.recipe_files(tmp_path) == ("recipe.json", "photo.jpg")
+
+
+def test_recipe_files_yml(tmp_path):
+    """Test finding a data file with the .yml extension."""
+    (tmp_path / "recipe.yml").write_text("title: YML\n")
+    assert build.recipe_files(tmp_path) == ("recipe.yml", "")
+
+
+def test_recipe_files_uppercase_extension(tmp_path):
+    """Test finding a data file with an uppercase extension."""
+    (tmp_path / "RECIPE.YAML").write_text("title: YAML\n")
+    assert build.recipe_files(tmp_path) == ("RECIPE.YAML", "")
+
+
+def test_recipe_files_missing_data_file(tmp_path):
+    """Test that a folder without a data file raises an OSError."""
+    (tmp_path / "photo.png").write_bytes(b"")
+    with pytest.raises(OSError, match="Recipe data file not found"):
+        build.recipe_files(tmp_path)
@@ -0,0 +1,34 @@
+"""Unit tests for reading data files."""
+
+from src.jmrecipes.builder import from_file
+
+
+def test_recipe_caches_yaml_only(tmp_path):
+    """Test that YAML files are cached and JSON files are parsed directly."""
+    cache_dir = tmp_path / "cache"
+    yaml_file = tmp_path / "recipe.yaml"
+    yaml_file.write_text("title: YAML Recipe\n")
+    json_file = tmp_path / "recipe.json"
+    json_file.write_text('{"title": "JSON Recipe"}')
+
+    assert from_file.recipe(yaml_file, cache_dir) == {"title": "YAML Recipe"}
+    assert len(list(cache_dir.glob("*.json"))) == 1
+    assert from_file.recipe(json_file, cache_dir) == {"title": "JSON Recipe"}
+    assert len(list(cache_dir.glob("*.json"))) == 1
+
+
+def test_prune_cache_deletes_removed_files(tmp_path):
+    """Test that cached copies of deleted data files are pruned."""
+    cache_dir = tmp_path / "cache"
+    kept_file = tmp_path / "kept.yaml"
+    kept_file.write_text("title: Kept\n")
+    removed_file = tmp_path / "removed.yml"
+    removed_file.write_text("title: Removed\n")
+    from_file.recipe(kept_file, cache_dir)
+    from_file.recipe(removed_file, cache_dir)
+    assert len(list(cache_dir.glob("*.json"))) == 2
+
+    removed_file.unlink()
+    from_file.prune_cache(cache_dir, tmp_path.iterdir())
+    assert len(list(cache_dir.glob("*.json"))) == 1
+    assert from_file.recipe(kept_file, cache_dir) == {"title": "Kept"}
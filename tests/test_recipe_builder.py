@@ -1,6 +1,8 @@
 """Unit tests for parsing and processing recipe and site data."""
 
+import json
 from pathlib import Path
+import pytest
 
 from src.jmrecipes import build
 
@@ -48,3 +50,26 @@ def test_ingredient_grocery_amoount():
     assert recipe["scales"][0]["ingredients"][2]["grocery_count"] == 2
     assert recipe["scales"][0]["ingredients"][3]["grocery_count"] == 3
     assert recipe["scales"][0]["ingredients"][4]["grocery_count"] == 0
+
+
+def test_time_string():
+    """Test formatting times with and without an explicit unit."""
+    recipe_dir = test_data / "recipe_times"
+    recipe = build.load_recipe(recipe_dir)
+    assert recipe["times"][0]["time_string"] == "1½ hours"
+    assert recipe["times"][1]["time_string"] == "20 minutes"
+
+
+def test_time_unit_null():
+    """Test that a time unit given as null is rejected."""
+    recipe_dir = test_data / "recipe_time_unit_null"
+    with pytest.raises(TypeError, match="time unit is a"):
+        build.load_recipe(recipe_dir)
+
+
+def test_schema_string_format():
+    """Test that the recipe schema uses the standard library JSON format."""
+    recipe_dir = test_data / "recipe_yield_unit"
+    recipe = build.load_recipe(recipe_dir)
+    schema = json.loads(recipe["schema_string"])
+    assert recipe["schema_string"] == json.dumps(schema)
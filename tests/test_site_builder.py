@@ -27,3 +27,16 @@ def test_nested_recipe_loop_error():
     site_dir = test_data / "site_nested_recipe_loop_error"
     with pytest.raises(ValueError, match="Cyclic recipe reference found"):
         build.load_site(site_dir)
+
+
+def test_nested_recipe_loop_broken_by_explicit_ingredient_values():
+    """Test that explicit values on a parent ingredient break a recipe loop."""
+    site_dir = test_data / "site_nested_recipe_loop_explicit"
+    site = build.load_site(site_dir)
+    recipes = {recipe["url_slug"]: recipe for recipe in site["recipes"]}
+    recipe_1 = recipes["recipe-1"]["scales"][0]
+    recipe_2 = recipes["recipe-2"]["scales"][0]
+    assert recipe_1["cost"] == 5
+    assert recipe_1["nutrition"]["calories"] == 100
+    assert recipe_2["cost_final"]
+    assert recipe_2["nutrition_final"]
@@ -34,3 +34,36 @@ def test_youtube_url_id():
     )
     assert utils.youtube_url_id("https://youtu.be/RmeM7WYB5Os") == "RmeM7WYB5Os"
     assert utils.youtube_url_id("https://youtu.be/RmeM7WYB5Os?t=2") == "RmeM7WYB5Os"
+
+
+def test_write_file(tmp_path):
+    """Test writing text replaces existing file contents."""
+
+    path = tmp_path / "index.html"
+    utils.write_file("<p>old content</p>", path)
+    utils.write_file("<p>½ cup</p>", path)
+    assert path.read_text(encoding="utf-8") == "<p>½ cup</p>"
+
+
+def test_write_file_keeps_hard_links(tmp_path):
+    """Test rewriting a file leaves hard-linked snapshots unchanged."""
+
+    path = tmp_path / "index.html"
+    snapshot = tmp_path / "snapshot.html"
+    utils.write_file("<p>old content</p>", path)
+    utils.link_or_copy(path, snapshot)
+    utils.write_file("<p>new content</p>", path)
+    assert snapshot.read_text(encoding="utf-8") == "<p>old content</p>"
+    assert path.read_text(encoding="utf-8") == "<p>new content</p>"
+
+
+def test_copy_file_does_not_link_source(tmp_path):
+    """Test editing a copied source file in place leaves the copy unchanged."""
+
+    source = tmp_path / "image.jpg"
+    destination = tmp_path / "copy.jpg"
+    source.write_bytes(b"old image")
+    utils.copy_file(source, destination)
+    with open(source, "r+b") as f:
+        f.write(b"new")
+    assert destination.read_bytes() == b"old image"